@@ -50,11 +50,13 @@ async def create_bookmark(
         HTTPException: RFPが見つからない、または作成エラー
     """
     try:
-        # RFPの存在確認
+        # RFPの存在確認と既存ブックマークの確認（冪等性のため）を1回のクエリで行う
+        # bookmarksはRFPに埋め込み、ユーザーのものだけに絞り込む
         rfp_response = (
             supabase.table("rfps")
-            .select("id")
+            .select("id, bookmarks(*)")
             .eq("id", bookmark_data.rfp_id)
+            .eq("bookmarks.user_id", user_id)
             .execute()
         )
 
@@ -64,21 +66,13 @@ async def create_bookmark(
                 detail="指定されたRFPが見つかりません",
             )
 
-        # 既存のブックマークを確認（冪等性のため）
-        existing_bookmark = (
-            supabase.table("bookmarks")
-            .select("*")
-            .eq("user_id", user_id)
-            .eq("rfp_id", bookmark_data.rfp_id)
-            .execute()
-        )
-
         # 既にブックマーク済みの場合は既存のものを返却
-        if existing_bookmark.data:
+        existing_bookmarks = rfp_response.data[0].get("bookmarks") or []
+        if existing_bookmarks:
             logger.info(
                 f"既存のブックマークを返却しました: user_id={user_id}, rfp_id={bookmark_data.rfp_id}"
             )
-            return BookmarkResponse(**existing_bookmark.data[0])
+            return BookmarkResponse(**existing_bookmarks[0])
 
         # ブックマーク作成
         insert_data = {
@@ -315,7 +315,7 @@ async def get_rfps_with_matching(
         for record in response.data:
             rfp_data = record.get("rfps")
             if not rfp_data:
-                logger.warning(f"RFP data not found for match_snapshot with company_id={company_id}")
+                logger.warning(f"RFP data not found for match_snapshot with user_id={user_id}")
                 continue
 
             # RFP情報とマッチング情報を結合
@@ -604,6 +604,7 @@ async def generate_proposal_draft(
             summary_points = match_data.get("summary_points", [])
 
         # ProposalGeneratorを初期化して提案書を生成
+        # （レンダリングもtry内で完了させ、テンプレートエラーは500として返す）
         generator = ProposalGenerator()
         proposal_markdown = generator.generate_proposal_draft(
             rfp=rfp,
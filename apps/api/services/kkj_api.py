@@ -4,9 +4,12 @@ KKJ API連携サービス
 官公需情報ポータルサイトからRFPデータを取得します。
 """
 
+import io
 import logging
+import threading
 import time
 import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 import httpx
@@ -47,6 +50,24 @@ class KKJAPIClient:
         self.timeout = 30.0  # タイムアウト: 30秒
         self.max_retries = 3  # 最大リトライ回数
         self.rate_limit_delay = 1.0  # レート制限: 1秒
+        # レート制限はスレッド間で共有し、リクエストの開始間隔をrate_limit_delay以上に保つ
+        self._rate_limit_lock = threading.Lock()
+        self._next_request_at = 0.0
+
+    def _wait_for_rate_limit(self) -> None:
+        """
+        前回のリクエスト開始からrate_limit_delay秒が経過するまで待機します。
+
+        fetch_rfps_bulkで複数スレッドから呼ばれても、ロックで順番に待機させるため
+        リクエストの開始は常にrate_limit_delay秒以上の間隔になります。
+        """
+        with self._rate_limit_lock:
+            now = time.monotonic()
+            wait_time = self._next_request_at - now
+            if wait_time > 0:
+                time.sleep(wait_time)
+                now = self._next_request_at
+            self._next_request_at = now + self.rate_limit_delay
 
     def fetch_rfps(
         self,
@@ -100,6 +121,9 @@ class KKJAPIClient:
             try:
                 logger.debug(f"リクエスト試行 {attempt}/{self.max_retries}")
 
+                # レート制限遵守（リクエスト開始前に待機）
+                self._wait_for_rate_limit()
+
                 # HTTPリクエスト実行
                 with httpx.Client(timeout=self.timeout) as client:
                     response = client.get(self.api_url, params=params)
@@ -114,9 +138,6 @@ class KKJAPIClient:
                     rfps = self._filter_by_ng_keywords(rfps, ng_keywords)
                     logger.info(f"NGキーワードフィルタ後: {len(rfps)}件")
 
-                # レート制限遵守
-                time.sleep(self.rate_limit_delay)
-
                 return rfps
 
             except httpx.HTTPError as e:
@@ -138,6 +159,86 @@ class KKJAPIClient:
         logger.error(error_msg)
         raise last_exception or Exception(error_msg)
 
+    def fetch_rfps_bulk(
+        self,
+        prefecture_codes: list[str],
+        count: int = 100,
+        query: str = "*",
+        ng_keywords: list[str] | None = None,
+        max_concurrency: int = 8,
+    ) -> tuple[dict[str, list[dict[str, Any]]], dict[str, Exception]]:
+        """
+        複数の都道府県のRFP情報を並行して取得します。
+
+        都道府県ごとのfetch_rfpsを最大max_concurrency件まで同時に実行し、
+        レスポンスの待ち時間を重ねて削減します。リクエストの開始間隔は
+        スレッド間で共有するレート制限（rate_limit_delay）に従います。
+        重複した都道府県コードは1回だけ取得します。
+
+        Args:
+            prefecture_codes: 都道府県コードのリスト（JIS X0401準拠、01-47）
+            count: 県あたりの取得件数（デフォルト100、最大1000）
+            query: 検索クエリ（デフォルト "*"で全件）
+            ng_keywords: NGキーワードのリスト（除外したいキーワード）
+            max_concurrency: 同時実行数の上限
+
+        Returns:
+            (取得結果, 失敗) のタプル
+            - 取得結果: 都道府県コードをキー、RFP情報のdictリストを値とするdict
+              （prefecture_codesの順序を保持）
+            - 失敗: 取得に失敗した都道府県コードをキー、発生した例外を値とするdict
+
+        Raises:
+            ValueError: 無効な都道府県コードが含まれている場合
+        """
+        # 重複を除外（順序は保持）
+        unique_codes = list(dict.fromkeys(prefecture_codes))
+
+        invalid_codes = [code for code in unique_codes if code not in PREFECTURE_NAMES]
+        if invalid_codes:
+            raise ValueError(
+                f"無効な都道府県コード: {', '.join(invalid_codes)}. "
+                f"01-47の範囲で指定してください。"
+            )
+
+        logger.info(
+            f"KKJ API一括取得開始: prefecture_codes={unique_codes}, "
+            f"max_concurrency={max_concurrency}"
+        )
+
+        results: dict[str, list[dict[str, Any]]] = {}
+        errors: dict[str, Exception] = {}
+        if not unique_codes:
+            return results, errors
+
+        with ThreadPoolExecutor(
+            max_workers=min(max_concurrency, len(unique_codes))
+        ) as executor:
+            futures = {
+                code: executor.submit(
+                    self.fetch_rfps,
+                    prefecture_code=code,
+                    count=count,
+                    query=query,
+                    ng_keywords=ng_keywords,
+                )
+                for code in unique_codes
+            }
+
+            for code, future in futures.items():
+                try:
+                    results[code] = future.result()
+                except Exception as e:
+                    logger.error(f"都道府県コード {code} の取得に失敗しました: {e}")
+                    errors[code] = e
+
+        logger.info(
+            f"KKJ API一括取得完了: 成功={len(results)}/{len(unique_codes)}都道府県, "
+            f"合計={sum(len(rfps) for rfps in results.values())}件"
+        )
+
+        return results, errors
+
     def _parse_xml_response(self, xml_content: str) -> list[dict[str, Any]]:
         """
         XMLレスポンスをパースしてdictのリストに変換します。
@@ -152,36 +253,48 @@ class KKJAPIClient:
             ET.ParseError: XMLパースエラー
             ValueError: エラー要素が含まれている場合
         """
+        # 全体のツリーを構築せずにイベント単位で走査し、
+        # パース済みのSearchResult要素は都度親から切り離してピークメモリを抑える
+        rfps: list[dict[str, Any]] = []
+        path: list[str] = []
+        elems: list[ET.Element] = []
+        has_search_results = False
+
         try:
-            root = ET.fromstring(xml_content)
+            for event, elem in ET.iterparse(
+                io.StringIO(xml_content), events=("start", "end")
+            ):
+                if event == "start":
+                    path.append(elem.tag)
+                    elems.append(elem)
+                    if path[1:] == ["SearchResults"]:
+                        has_search_results = True
+                    continue
+
+                # エラーチェック
+                if path[1:] == ["Error"]:
+                    error_msg = elem.text or "不明なエラー"
+                    logger.error(f"API エラーレスポンス: {error_msg}")
+                    raise ValueError(f"KKJ APIエラー: {error_msg}")
+
+                # ヒット件数をログ出力
+                if path[1:] == ["SearchResults", "SearchHits"] and elem.text:
+                    logger.info(f"検索ヒット件数: {elem.text}")
+
+                # 各検索結果をパース
+                elif path[1:] == ["SearchResults", "SearchResult"]:
+                    rfps.append(self._parse_search_result(elem))
+                    # clear()だけでは空になった要素が親に残り続けるため、親から取り除く
+                    elems[-2].remove(elem)
+
+                path.pop()
+                elems.pop()
         except ET.ParseError as e:
             logger.error(f"XML解析失敗: {e}")
             raise
 
-        # エラーチェック
-        error_elem = root.find("Error")
-        if error_elem is not None:
-            error_msg = error_elem.text or "不明なエラー"
-            logger.error(f"API エラーレスポンス: {error_msg}")
-            raise ValueError(f"KKJ APIエラー: {error_msg}")
-
-        # 検索結果を抽出
-        rfps: list[dict[str, Any]] = []
-        search_results = root.find("SearchResults")
-
-        if search_results is None:
+        if not has_search_results:
             logger.warning("SearchResults要素が見つかりません")
-            return rfps
-
-        # ヒット件数をログ出力
-        search_hits_elem = search_results.find("SearchHits")
-        if search_hits_elem is not None and search_hits_elem.text:
-            logger.info(f"検索ヒット件数: {search_hits_elem.text}")
-
-        # 各検索結果をパース
-        for search_result in search_results.findall("SearchResult"):
-            rfp_data = self._parse_search_result(search_result)
-            rfps.append(rfp_data)
 
         return rfps
 
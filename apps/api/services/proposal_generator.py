@@ -20,6 +20,15 @@ from jinja2 import (
 # ロガー設定
 logger = logging.getLogger(__name__)
 
+# 提案書テンプレートファイル名
+PROPOSAL_TEMPLATE_NAME = "proposal_template.md"
+
+# 提案書生成に必須のフィールド
+_REQUIRED_RFP_FIELDS = frozenset(
+    ["id", "title", "issuing_org", "description", "region", "deadline"]
+)
+_REQUIRED_COMPANY_FIELDS = frozenset(["id", "name", "skills", "regions"])
+
 
 class ProposalGenerator:
     """
@@ -100,40 +109,11 @@ class ProposalGenerator:
             ValueError: 必須フィールドが不足している場合
             TemplateNotFound: テンプレートファイルが見つからない場合
         """
-        # 必須フィールドチェック
-        required_rfp_fields = [
-            "id",
-            "title",
-            "issuing_org",
-            "description",
-            "region",
-            "deadline",
-        ]
-        required_company_fields = ["id", "name", "skills", "regions"]
-
-        for field in required_rfp_fields:
-            if field not in rfp:
-                raise ValueError(f"RFPに必須フィールドがありません: {field}")
-
-        for field in required_company_fields:
-            if field not in company:
-                raise ValueError(f"会社情報に必須フィールドがありません: {field}")
-
-        logger.info(
-            f"提案書生成開始: rfp_id={rfp['id']}, company_id={company['id']}"
-        )
+        context = self._prepare_context(rfp, company, match_score, summary_points)
 
         try:
             # テンプレートを読み込み
-            template = self.env.get_template("proposal_template.md")
-
-            # テンプレート変数を準備
-            context = {
-                "rfp": rfp,
-                "company": company,
-                "match_score": match_score,
-                "summary_points": summary_points or [],
-            }
+            template = self.env.get_template(PROPOSAL_TEMPLATE_NAME)
 
             # テンプレートをレンダリング
             proposal_markdown = template.render(**context)
@@ -154,6 +134,53 @@ class ProposalGenerator:
             logger.error(error_msg)
             raise
 
+    def _prepare_context(
+        self,
+        rfp: dict[str, Any],
+        company: dict[str, Any],
+        match_score: int | None,
+        summary_points: list[str] | None,
+    ) -> dict[str, Any]:
+        """
+        入力を検証し、テンプレート変数を準備します。
+
+        Args:
+            rfp: RFP情報辞書
+            company: 会社情報辞書
+            match_score: マッチングスコア
+            summary_points: マッチングサマリーポイント
+
+        Returns:
+            テンプレートに渡すコンテキスト辞書
+
+        Raises:
+            ValueError: 必須フィールドが不足している場合
+        """
+        # 必須フィールドチェック（不足しているフィールドをまとめて報告）
+        missing_rfp_fields = _REQUIRED_RFP_FIELDS - rfp.keys()
+        if missing_rfp_fields:
+            raise ValueError(
+                f"RFPに必須フィールドがありません: {', '.join(sorted(missing_rfp_fields))}"
+            )
+
+        missing_company_fields = _REQUIRED_COMPANY_FIELDS - company.keys()
+        if missing_company_fields:
+            raise ValueError(
+                "会社情報に必須フィールドがありません: "
+                f"{', '.join(sorted(missing_company_fields))}"
+            )
+
+        logger.info(
+            f"提案書生成開始: rfp_id={rfp['id']}, company_id={company['id']}"
+        )
+
+        return {
+            "rfp": rfp,
+            "company": company,
+            "match_score": match_score,
+            "summary_points": summary_points or [],
+        }
+
     def _format_budget(self, budget: int | None) -> str:
         """
         予算を日本円形式でフォーマットします。
@@ -198,4 +225,6 @@ class ProposalGenerator:
             date_value = date_value.date()
 
         # 日本語形式にフォーマット
-        return f"{date_value.year}年{date_value.month}月{date_value.day}日"
+        # strftime("%m")はゼロ埋めされるため使わず、年月日を一度だけ取り出してf-stringで組み立てる
+        year, month, day = date_value.year, date_value.month, date_value.day
+        return f"{year}年{month}月{day}日"
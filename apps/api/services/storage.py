@@ -4,8 +4,10 @@ Supabase Storageサービス
 ファイルのアップロード/ダウンロード用の署名付きURL生成、ファイル削除を提供します。
 """
 import logging
+import mimetypes
 import os
 import re
+import time
 import uuid
 from pathlib import Path
 from typing import Tuple
@@ -14,6 +16,14 @@ from supabase import Client
 
 logger = logging.getLogger(__name__)
 
+__all__ = [
+    "StorageService",
+    "BUCKET_NAME",
+    "UPLOAD_URL_EXPIRES_IN",
+    "DOWNLOAD_URL_EXPIRES_IN",
+    "MAX_FILE_SIZE",
+]
+
 # Storage設定
 BUCKET_NAME = "company-documents"
 UPLOAD_URL_EXPIRES_IN = 300  # 5分（秒）
@@ -21,6 +31,28 @@ DOWNLOAD_URL_EXPIRES_IN = 3600  # 1時間（秒）
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
 
 
+def _generate_document_id() -> str:
+    """
+    時系列順に並ぶドキュメントIDを生成（UUIDv7, RFC 9562）
+
+    先頭48ビットにミリ秒単位のUNIX時刻、残りに乱数を格納します。
+    生成順にソートされるため、Storageパスやインデックスの局所性が向上します。
+
+    Returns:
+        str: UUIDv7文字列
+    """
+    timestamp_ms = time.time_ns() // 1_000_000
+    random_bits = int.from_bytes(os.urandom(10), "big")
+
+    value = (timestamp_ms & 0xFFFF_FFFF_FFFF) << 80
+    value |= 0x7 << 76  # version 7
+    value |= ((random_bits >> 62) & 0xFFF) << 64  # rand_a (12ビット)
+    value |= 0b10 << 62  # variant (RFC 9562)
+    value |= random_bits & 0x3FFF_FFFF_FFFF_FFFF  # rand_b (62ビット)
+
+    return str(uuid.UUID(int=value))
+
+
 class StorageService:
     """Supabase Storage操作サービス"""
 
@@ -97,7 +129,6 @@ class StorageService:
             ValueError: 許可されていないファイルタイプの場合
         """
         # 拡張子からMIME Typeを推測
-        import mimetypes
         mime_type, _ = mimetypes.guess_type(filename)
 
         if not mime_type:
@@ -123,12 +154,25 @@ class StorageService:
         Returns:
             str: Storageパス
         """
-        # ドキュメントIDを生成
-        document_id = str(uuid.uuid4())
-
         # ファイル名をサニタイズ
         safe_filename = self.sanitize_filename(filename)
 
+        return self._build_storage_path(user_id, safe_filename)
+
+    def _build_storage_path(self, user_id: str, safe_filename: str) -> str:
+        """
+        サニタイズ済みファイル名からStorageパスを組み立て
+
+        Args:
+            user_id: ユーザーID
+            safe_filename: サニタイズ済みのファイル名
+
+        Returns:
+            str: Storageパス
+        """
+        # ドキュメントIDを生成（時系列順のUUIDv7）
+        document_id = _generate_document_id()
+
         # パスを生成
         storage_path = f"{user_id}/{document_id}/{safe_filename}"
 
@@ -161,12 +205,15 @@ class StorageService:
                 f"ファイルサイズが制限を超えています（最大: {MAX_FILE_SIZE / 1024 / 1024}MB）"
             )
 
+        # ファイル名のサニタイズは一度だけ行い、検証とパス生成で共有する
+        safe_filename = self.sanitize_filename(filename)
+
         # ファイルタイプ検証（kindが提供されている場合）
         if kind and kind != 'url':
-            self.validate_file_type(kind, filename)
+            self.validate_file_type(kind, safe_filename)
 
         # Storageパス生成
-        storage_path = self.generate_storage_path(user_id, filename)
+        storage_path = self._build_storage_path(user_id, safe_filename)
 
         try:
             # 署名付きアップロードURL生成
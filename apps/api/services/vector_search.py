@@ -6,6 +6,7 @@ Supabase pgvectorを使用したセマンティック検索機能を提供しま
 import logging
 from typing import Any
 
+import orjson
 from supabase import Client
 
 from services.embedding import EmbeddingService
@@ -33,6 +34,26 @@ def _escape_like_pattern(pattern: str) -> str:
     )
 
 
+def _to_vector_literal(embedding: list[float] | str) -> str:
+    """
+    埋め込みベクトルをpgvectorのテキスト表現に変換します。
+
+    RPCパラメータをfloat配列のまま渡すと、Supabaseクライアントが
+    標準のjsonモジュールで1536要素を1つずつシリアライズするため、
+    orjsonで事前に"[0.1,0.2,...]"形式の文字列に変換して渡します。
+    PostgreSQL側ではvector型の入力としてそのまま解釈されます。
+
+    Args:
+        embedding: 埋め込みベクトル（DBから取得済みの文字列表現も可）
+
+    Returns:
+        pgvectorのテキスト表現
+    """
+    if isinstance(embedding, str):
+        return embedding
+    return orjson.dumps(embedding).decode()
+
+
 class VectorSearchService:
     """
     ベクトル検索サービスクラス
@@ -99,7 +120,7 @@ class VectorSearchService:
             response = self.supabase.rpc(
                 "search_rfps_by_embedding",
                 {
-                    "query_embedding": query_embedding,
+                    "query_embedding": _to_vector_literal(query_embedding),
                     "similarity_threshold": similarity_threshold,
                     "result_limit": result_limit,
                 },
@@ -168,7 +189,7 @@ class VectorSearchService:
             response = self.supabase.rpc(
                 "search_rfps_by_embedding",
                 {
-                    "query_embedding": rfp_embedding,
+                    "query_embedding": _to_vector_literal(rfp_embedding),
                     "similarity_threshold": 0.5,  # より緩い閾値
                     "result_limit": result_limit + 1,  # 自分自身を含めて取得
                 },
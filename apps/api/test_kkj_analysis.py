@@ -4,13 +4,198 @@ KKJ API実データ取得・分析スクリプト
 実際のKKJ APIからサンプルデータを取得して、DB設計との適合性を分析します。
 """
 
-import json
+import hashlib
+import os
 import sys
+import time
+from collections import defaultdict
 from datetime import datetime
-from services.kkj_api import KKJAPIClient
 
-def analyze_kkj_data():
-    """KKJ APIから実データを取得して分析"""
+import orjson
+
+from services.kkj_api import KKJAPIClient, PREFECTURE_NAMES
+
+# サンプルデータのキャッシュファイル（都道府県コードと取得条件のハッシュが入る）
+SAMPLE_DATA_PATH = '/tmp/kkj_sample_data_{}_{}.json'
+
+# キャッシュの有効期間（秒）。KKJ_CACHE_TTL=0 で常にAPIから再取得
+# （KKJ_DUMP_SAMPLEを設定すると、確認用に整形したJSONを保存）
+DEFAULT_CACHE_TTL = 3600
+
+# フィールド統計テーブルの行フォーマット
+FIELD_ROW_FORMAT = "{:30s} | {:8s} | {:8s} | {:15s} | {}"
+
+# レスポンスフィールド一覧の行フォーマット
+RESPONSE_FIELD_FORMAT = "  {:30s} (Type: {:15s}, 非空: {}/{})"
+
+# 空値があると課題となるフィールド: (APIフィールド, 優先度, 表示名, 項目名, 影響)
+EMPTY_FIELD_ISSUES = (
+    ('key', 'クリティカル', 'external_id (key)', 'キーフィールド', 'external_id必須制約に違反'),
+    ('cft_issue_date', 'クリティカル', 'deadline (cft_issue_date)', '締切日', 'deadline必須制約に違反'),
+    ('lg_code', 'クリティカル', 'region (lg_code)', '都道府県コード', 'region必須制約に違反'),
+    ('project_description', '中優先度', 'description (project_description)', 'プロジェクト説明', 'description必須制約に違反'),
+)
+
+# JSON由来の型をビットに割り当て、フィールドごとの型の集合を1つの整数で保持する
+_TYPE_BITS = {
+    str: 1,
+    int: 2,
+    float: 4,
+    bool: 8,
+    list: 16,
+    dict: 32,
+    type(None): 64,
+}
+_OTHER_TYPE_BIT = 128
+
+# 表示用の (ビット, 型名)。型名の昇順に並べておく
+_TYPE_BIT_NAMES = sorted(
+    [(bit, cls.__name__) for cls, bit in _TYPE_BITS.items()] + [(_OTHER_TYPE_BIT, 'other')],
+    key=lambda item: item[1],
+)
+
+
+def _load_or_fetch(client, prefecture_codes, ttl_seconds=None, **fetch_kwargs):
+    """
+    キャッシュが新しければ読み込み、古ければKKJ APIから取得してキャッシュを更新
+
+    Args:
+        client: KKJAPIClient
+        prefecture_codes: 都道府県コードのリスト
+        ttl_seconds: キャッシュの有効期間（秒）。省略時はKKJ_CACHE_TTL環境変数
+        **fetch_kwargs: client.fetch_rfps_bulkに渡す引数（キャッシュキーにも使うためJSONに変換できる値）
+
+    Returns:
+        RFP情報のdictリスト（全都道府県分を連結）
+    """
+    # 取得条件（件数・検索語など）が異なれば結果も異なるため、キャッシュキーに含める
+    kwargs_digest = hashlib.sha256(
+        orjson.dumps(fetch_kwargs, option=orjson.OPT_SORT_KEYS)
+    ).hexdigest()[:12]
+    path = SAMPLE_DATA_PATH.format('_'.join(prefecture_codes), kwargs_digest)
+
+    if ttl_seconds is None:
+        ttl_seconds = int(os.getenv('KKJ_CACHE_TTL', DEFAULT_CACHE_TTL))
+
+    if ttl_seconds > 0 and os.path.exists(path):
+        age = time.time() - os.path.getmtime(path)
+        if age < ttl_seconds:
+            # パースは検証を兼ねて1回だけ行い、成功した結果をそのまま使う
+            with open(path, 'rb') as f:
+                try:
+                    cached = orjson.loads(f.read())
+                except orjson.JSONDecodeError:
+                    cached = None
+            if isinstance(cached, list):
+                print(f"   キャッシュを使用: {path}（{int(age)}秒前に取得）")
+                return cached
+            print(f"   キャッシュが不正なため再取得します: {path}")
+
+    # 都道府県ごとのリクエストを並行して実行
+    rfps_by_prefecture, errors = client.fetch_rfps_bulk(prefecture_codes, **fetch_kwargs)
+    rfps = [rfp for code_rfps in rfps_by_prefecture.values() for rfp in code_rfps]
+    for code, error in errors.items():
+        print(f"   取得失敗: {PREFECTURE_NAMES.get(code, code)}（コード{code}）: {error}")
+
+    # 一部の都道府県の取得失敗や0件の結果をキャッシュすると、障害時の結果を
+    # 有効期間中ずっと使い続けてしまうため書き出さない
+    if errors or not rfps:
+        print("   取得結果が不完全なため、キャッシュを更新しません")
+        return rfps
+
+    # サンプルデータを保存（キャッシュ無効かつダンプ不要なら書き出さない）
+    dump_sample = bool(os.getenv('KKJ_DUMP_SAMPLE'))
+    if ttl_seconds > 0 or dump_sample:
+        # 整形出力はデバッグ用のダンプ時のみ（キャッシュとしては非整形で十分）
+        option = orjson.OPT_INDENT_2 if dump_sample else 0
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(rfps, option=option))
+
+    return rfps
+
+
+def _dedupe_records(rfps):
+    """
+    内容が同一のレコードを除外する
+
+    ページング再試行などで重複したレコードを、キー順を正規化した
+    JSONバイト列で判定して1件にまとめる（ハッシュ値の衝突で別レコードを落とさないよう、
+    バイト列そのものを保持する）。
+
+    Args:
+        rfps: RFP情報のdictリスト
+
+    Returns:
+        tuple[list, int]: (重複を除いたレコード, 除外した件数)
+    """
+    seen = set()
+    unique = []
+    for rfp in rfps:
+        serialized = orjson.dumps(rfp, option=orjson.OPT_SORT_KEYS)
+        if serialized in seen:
+            continue
+        seen.add(serialized)
+        unique.append(rfp)
+    return unique, len(rfps) - len(unique)
+
+
+def _write_rows(rows):
+    """複数行をまとめて1回で標準出力に書き出す"""
+    if rows:
+        sys.stdout.write("\n".join(rows) + "\n")
+
+
+def _format_types(mask):
+    """型のビットマスクを型名のカンマ区切り文字列に変換"""
+    return ', '.join(name for bit, name in _TYPE_BIT_NAMES if mask & bit)
+
+
+def _new_field_stat():
+    """フィールド統計の初期値（typesは_TYPE_BITSのビットマスク）"""
+    return {
+        'count': 0,
+        'non_empty': 0,
+        'types': 0,
+        'sample_values': []
+    }
+
+
+def _collect_field_stats(rfps):
+    """
+    全レコードを1パスで走査してフィールドごとの出現状況を集計
+
+    Args:
+        rfps: RFP情報のdictリスト
+
+    Returns:
+        フィールド名をキーとする統計dict
+    """
+    field_stats = defaultdict(_new_field_stat)
+    for rfp in rfps:
+        for key, value in rfp.items():
+            stats = field_stats[key]
+            stats['count'] += 1
+            stats['types'] |= _TYPE_BITS.get(value.__class__, _OTHER_TYPE_BIT)
+            
+            if value:
+                stats['non_empty'] += 1
+                sample_values = stats['sample_values']
+                if len(sample_values) < 2:
+                    sample_val = str(value)[:80] if not isinstance(value, list) else f"list[{len(value)}]"
+                    sample_values.append(sample_val)
+    
+    return dict(field_stats)
+
+
+def analyze_kkj_data(prefecture_codes=("13",), count=5):
+    """
+    KKJ APIから実データを取得して分析
+
+    Args:
+        prefecture_codes: 対象の都道府県コード（デフォルト: 東京都）
+        count: 県あたりの取得件数
+    """
+    prefecture_codes = list(dict.fromkeys(prefecture_codes))
     
     print("=" * 80)
     print("KKJ API実データ取得・分析")
@@ -19,23 +204,29 @@ def analyze_kkj_data():
     # KKJ APIクライアント初期化
     client = KKJAPIClient()
     
-    # 東京都（コード13）から5件取得
+    # 指定都道府県から取得
     try:
         print("\n[1] KKJ APIからデータを取得中...")
-        print("   対象: 東京都（コード13）、取得件数: 5件")
+        targets = ', '.join(
+            f"{PREFECTURE_NAMES.get(code, code)}（コード{code}）" for code in prefecture_codes
+        )
+        print(f"   対象: {targets}、取得件数: {count}件/県")
         
-        rfps = client.fetch_rfps(
-            prefecture_code="13",
-            count=5,
+        rfps = _load_or_fetch(
+            client,
+            prefecture_codes,
+            count=count,
             query="*",
             ng_keywords=[]
         )
         
-        print(f"   取得成功: {len(rfps)}件\n")
+        rfps, duplicate_count = _dedupe_records(rfps)
         
-        # サンプルデータを保存
-        with open('/tmp/kkj_sample_data.json', 'w', encoding='utf-8') as f:
-            json.dump(rfps, f, ensure_ascii=False, indent=2)
+        print(f"   取得成功: {len(rfps)}件")
+        if duplicate_count:
+            total = len(rfps) + duplicate_count
+            print(f"   重複除外: {duplicate_count}/{total}件（{duplicate_count / total:.1%}）")
+        print()
         
         print("[2] APIレスポンス構造の詳細分析\n")
         
@@ -59,42 +250,29 @@ def analyze_kkj_data():
             print("\n[3] 全レコードのフィールド統計\n")
             
             # すべてのレコードでフィールドの出現状況を集計
-            field_stats = {}
-            for rfp in rfps:
-                for key, value in rfp.items():
-                    if key not in field_stats:
-                        field_stats[key] = {
-                            'count': 0,
-                            'non_empty': 0,
-                            'types': set(),
-                            'sample_values': []
-                        }
-                    
-                    field_stats[key]['count'] += 1
-                    if value:
-                        field_stats[key]['non_empty'] += 1
-                    
-                    field_stats[key]['types'].add(type(value).__name__)
-                    
-                    if len(field_stats[key]['sample_values']) < 2 and value:
-                        sample_val = str(value)[:80] if not isinstance(value, list) else f"list[{len(value)}]"
-                        field_stats[key]['sample_values'].append(sample_val)
-            
-            # フィールド統計を表示
-            print(f"{'Field Name':30s} | {'出現率':8s} | {'非空':8s} | {'データ型':15s} | {'サンプル値'}")
-            print("-" * 120)
+            field_stats = _collect_field_stats(rfps)
+            
+            # 表示用にフィールド名順で1回だけ並べ替え、以降の表示で使い回す
+            sorted_stats = sorted(field_stats.items())
             
-            for key in sorted(field_stats.keys()):
-                stats = field_stats[key]
-                count = stats['count']
+            # フィールド統計を表示（行をまとめてから一度に出力）
+            rows = [
+                FIELD_ROW_FORMAT.format('Field Name', '出現率', '非空', 'データ型', 'サンプル値'),
+                "-" * 120,
+            ]
+            
+            for key, stats in sorted_stats:
+                appear_count = stats['count']
                 non_empty = stats['non_empty']
-                types = ', '.join(sorted(stats['types']))
+                types = _format_types(stats['types'])
                 sample = stats['sample_values'][0] if stats['sample_values'] else "-"
                 
-                appear_rate = f"{count}/{len(rfps)}" if count == len(rfps) else f"{count}/{len(rfps)}"
+                appear_rate = f"{appear_count}/{len(rfps)}"
                 non_empty_rate = f"{non_empty}/{len(rfps)}"
                 
-                print(f"{key:30s} | {appear_rate:8s} | {non_empty_rate:8s} | {types:15s} | {sample}")
+                rows.append(FIELD_ROW_FORMAT.format(key, appear_rate, non_empty_rate, types, sample))
+            
+            _write_rows(rows)
             
             print("\n[4] DB設計との比較\n")
             print("◆ DB (rfps テーブル)のカラム:")
@@ -121,11 +299,12 @@ def analyze_kkj_data():
             
             print("\n◆ KKJ APIのレスポンスフィールド:")
             print("-" * 80)
-            for key in sorted(field_stats.keys()):
-                stats = field_stats[key]
-                types = ', '.join(sorted(stats['types']))
+            rows = []
+            for key, stats in sorted_stats:
+                types = _format_types(stats['types'])
                 non_empty = stats['non_empty']
-                print(f"  {key:30s} (Type: {types:15s}, 非空: {non_empty}/{len(rfps)})")
+                rows.append(RESPONSE_FIELD_FORMAT.format(key, types, non_empty, len(rfps)))
+            _write_rows(rows)
             
             print("\n[5] マッピング候補\n")
             
@@ -153,17 +332,8 @@ def analyze_kkj_data():
             # 実データから課題を検出
             issues = []
             
-            # external_id の確認
-            if 'key' in field_stats and field_stats['key']['non_empty'] < len(rfps):
-                issues.append({
-                    'level': 'クリティカル',
-                    'field': 'external_id (key)',
-                    'issue': f"キーフィールドが空のレコードが存在（{len(rfps) - field_stats['key']['non_empty']}件）",
-                    'impact': 'external_id必須制約に違反'
-                })
-            
             # budgetの確認
-            if 'budget' not in [key for key in field_stats.keys()]:
+            if 'budget' not in field_stats:
                 issues.append({
                     'level': '高優先度',
                     'field': 'budget',
@@ -171,32 +341,19 @@ def analyze_kkj_data():
                     'impact': 'すべてのレコードでbudgetがNULLになる'
                 })
             
-            # deadlineの確認
-            if 'cft_issue_date' in field_stats and field_stats['cft_issue_date']['non_empty'] < len(rfps):
-                issues.append({
-                    'level': 'クリティカル',
-                    'field': 'deadline (cft_issue_date)',
-                    'issue': f"締切日が空のレコードが存在（{len(rfps) - field_stats['cft_issue_date']['non_empty']}件）",
-                    'impact': 'deadline必須制約に違反'
-                })
-            
-            # 地域情報の確認
-            if 'lg_code' in field_stats and field_stats['lg_code']['non_empty'] < len(rfps):
-                issues.append({
-                    'level': 'クリティカル',
-                    'field': 'region (lg_code)',
-                    'issue': f"都道府県コードが空のレコードが存在（{len(rfps) - field_stats['lg_code']['non_empty']}件）",
-                    'impact': 'region必須制約に違反'
-                })
-            
-            # descriptionの確認
-            if 'project_description' in field_stats and field_stats['project_description']['non_empty'] < len(rfps):
-                issues.append({
-                    'level': '中優先度',
-                    'field': 'description (project_description)',
-                    'issue': f"プロジェクト説明が空のレコードが存在（{len(rfps) - field_stats['project_description']['non_empty']}件）",
-                    'impact': 'description必須制約に違反'
-                })
+            # 空値を含む必須系フィールドの確認
+            for api_field, level, field, label, impact in EMPTY_FIELD_ISSUES:
+                stats = field_stats.get(api_field)
+                if stats is None:
+                    continue
+                empty_count = len(rfps) - stats['non_empty']
+                if empty_count > 0:
+                    issues.append({
+                        'level': level,
+                        'field': field,
+                        'issue': f"{label}が空のレコードが存在（{empty_count}件）",
+                        'impact': impact
+                    })
             
             if not issues:
                 print("  検出された主要な課題はありません（サンプルデータ内）")
@@ -222,7 +379,8 @@ def analyze_kkj_data():
         return None
 
 if __name__ == "__main__":
-    rfps = analyze_kkj_data()
+    # 引数で都道府県コードを指定可能（例: python test_kkj_analysis.py 13 27）
+    rfps = analyze_kkj_data(sys.argv[1:] or ("13",))
     if rfps:
         sys.exit(0)
     else:
@@ -6,8 +6,8 @@ pytestの共通フィクスチャとテストユーティリティ
 import os
 import sys
 from pathlib import Path
-from typing import AsyncGenerator, Generator
-from unittest.mock import MagicMock, AsyncMock
+from types import MappingProxyType
+from typing import Any, AsyncGenerator, Generator, Mapping
 from dotenv import load_dotenv
 
 # プロジェクトルートをPYTHONPATHに追加
@@ -18,8 +18,7 @@ sys.path.insert(0, str(project_root))
 load_dotenv(project_root / ".env")
 
 import pytest
-from fastapi.testclient import TestClient
-from supabase import Client
+from httpx import ASGITransport, AsyncClient
 
 # 環境変数設定（テスト用のダミー値）
 # ただし、実際のSupabase環境変数がある場合はそれを優先
@@ -33,67 +32,171 @@ if not os.getenv("OPENAI_API_KEY"):
     os.environ["OPENAI_API_KEY"] = "test-openai-key"
 
 from main import app
-from database import get_supabase_client
-from middleware.auth import get_current_user_id
+from database import get_service_supabase_client, get_supabase_client
+from middleware.auth import get_auth_token, get_current_user_id
 
+# テスト対象のサービス・ユーティリティを収集時に読み込んでおく
+# （xdistの各ワーカーで、最初のテスト実行時にimportコストが集中しないようにする）
+import services.proposal_generator  # noqa: F401
+import utils.datetime_parser  # noqa: F401
 
-@pytest.fixture
-def test_user_id() -> str:
-    """テスト用のユーザーID"""
-    return "test-user-123"
+# ダミーのembedding（import時に1回だけ生成し、各フィクスチャで共有する）
+MOCK_RFP_EMBEDDING = [0.1] * 1536
+MOCK_COMPANY_EMBEDDING = [0.2] * 1536
 
+class FakeSupabaseResponse:
+    """Supabaseのexecute()結果を模したレスポンス"""
 
-@pytest.fixture
-def mock_supabase_client() -> Generator[MagicMock, None, None]:
+    def __init__(self, data: Any = None, count: int | None = None):
+        self.data = data
+        self.count = count
+
+
+class FakeSupabaseQuery:
+    """
+    FakeSupabaseのクエリビルダー
+
+    任意のメソッドチェーンを受け付けて自身を返し、呼び出しをFakeSupabase.callsに記録します。
+    execute()ではキューに積まれたレスポンスを先頭から1件返します。
+    """
+
+    def __init__(self, fake: "FakeSupabase", table: str):
+        self._fake = fake
+        self._table = table
+
+    def __getattr__(self, name: str):
+        if name.startswith("__"):
+            raise AttributeError(name)
+
+        def method(*args, **kwargs) -> "FakeSupabaseQuery":
+            self._fake.calls.append((self._table, name, args, kwargs))
+            return self
+
+        return method
+
+    def execute(self) -> Any:
+        """キューに積まれたレスポンスを先頭から1件返す"""
+        self._fake.calls.append((self._table, "execute", (), {}))
+        return self._fake.next_response()
+
+
+class FakeSupabase:
     """
-    Supabaseクライアントのモック
+    クエリの発行順にレスポンスを返すSupabaseクライアントのスタブ
 
-    各テストで具体的なレスポンスを設定できます。
+    execute()が呼ばれた順にqueue()で積んだレスポンスを返し、キューが空の場合は
+    空のレスポンスを返します。参照したテーブル名はtablesに、クエリビルダーの
+    呼び出しはcallsに (テーブル名, メソッド名, 位置引数, キーワード引数) として記録されます。
 
     Examples:
-        >>> def test_example(mock_supabase_client):
-        ...     mock_supabase_client.table().select().execute.return_value.data = [{"id": "1"}]
+        >>> fake_supabase.queue(FakeSupabaseResponse(company_data), FakeSupabaseResponse(rfp_data))
+        >>> assert fake_supabase.tables == ["companies", "rfps"]
+        >>> assert ("bookmarks", "range", (10, 19), {}) in fake_supabase.calls
     """
-    mock_client = MagicMock(spec=Client)
 
-    # デフォルトのチェーンメソッドモック
-    mock_table = MagicMock()
-    mock_client.table.return_value = mock_table
+    def __init__(self):
+        self._responses: list = []
+        self.tables: list[str] = []
+        self.calls: list[tuple[str, str, tuple, dict]] = []
 
-    # executeメソッドのレスポンスモック
-    mock_response = MagicMock()
-    mock_response.data = []
-    mock_response.count = 0
-    mock_table.select.return_value.execute.return_value = mock_response
-    mock_table.insert.return_value.execute.return_value = mock_response
-    mock_table.update.return_value.execute.return_value = mock_response
-    mock_table.delete.return_value.execute.return_value = mock_response
+    def queue(self, *responses) -> None:
+        """execute()で返すレスポンスを末尾に追加する"""
+        self._responses.extend(responses)
 
-    yield mock_client
+    def next_response(self) -> Any:
+        """キューの先頭のレスポンスを取り出す（空の場合は空のレスポンス）"""
+        if not self._responses:
+            return FakeSupabaseResponse([], count=0)
+        return self._responses.pop(0)
 
+    def table(self, name: str) -> FakeSupabaseQuery:
+        self.tables.append(name)
+        return FakeSupabaseQuery(self, name)
 
-@pytest.fixture
-def client(mock_supabase_client: MagicMock, test_user_id: str) -> Generator[TestClient, None, None]:
+    def reset(self) -> None:
+        """積んだレスポンスと記録を破棄する"""
+        self._responses.clear()
+        self.tables.clear()
+        self.calls.clear()
+
+
+# テスト用のユーザーID（依存性の上書きはセッションで1回だけ行うため定数で持つ）
+TEST_USER_ID = "test-user-123"
+TEST_AUTH_TOKEN = "test-auth-token"
+
+
+@pytest.fixture(scope="session")
+def test_user_id() -> str:
+    """テスト用のユーザーID"""
+    return TEST_USER_ID
+
+
+@pytest.fixture(scope="session")
+def fake_supabase() -> FakeSupabase:
     """
-    FastAPIテストクライアント
+    Supabaseクライアントのスタブ（セッションで共有）
 
-    認証とSupabaseクライアントをモックします。
+    各テストでqueue()によりレスポンスを設定します。
+    テストごとの設定と記録は_reset_fake_supabaseがテスト終了時に初期化します。
     """
-    # 依存性のオーバーライド
-    app.dependency_overrides[get_supabase_client] = lambda: mock_supabase_client
-    app.dependency_overrides[get_current_user_id] = lambda: test_user_id
+    return FakeSupabase()
 
-    with TestClient(app) as test_client:
-        yield test_client
+
+@pytest.fixture(autouse=True)
+def _reset_fake_supabase(fake_supabase: FakeSupabase) -> Generator[None, None, None]:
+    """テスト終了時にSupabaseクライアントのスタブを初期状態に戻し、次のテストに設定が漏れないようにする"""
+    yield
+    fake_supabase.reset()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _override_dependencies(fake_supabase: FakeSupabase) -> Generator[None, None, None]:
+    """
+    認証とSupabaseクライアントの依存性をセッション開始時に1回だけスタブへ差し替える
+
+    スタブはセッションで共有し、テストごとの設定は_reset_fake_supabaseが初期化します。
+    pytest-xdistで並列実行する場合、セッションスコープのフィクスチャはワーカーごとに生成されます。
+    """
+    app.dependency_overrides[get_supabase_client] = lambda: fake_supabase
+    app.dependency_overrides[get_service_supabase_client] = lambda: fake_supabase
+    app.dependency_overrides[get_current_user_id] = lambda: TEST_USER_ID
+    app.dependency_overrides[get_auth_token] = lambda: TEST_AUTH_TOKEN
+
+    yield
 
     # クリーンアップ
     app.dependency_overrides.clear()
 
 
 @pytest.fixture
-def mock_rfp_data() -> dict:
-    """テスト用のRFPデータ"""
-    return {
+async def async_client() -> AsyncGenerator[AsyncClient, None]:
+    """
+    FastAPI非同期テストクライアント
+
+    ASGITransportでアプリを直接呼び出すため、TestClientのようにスレッド経由で
+    イベントループを往復せず、起動時のSupabase接続チェック（lifespan）も実行しません。
+    アプリと依存性の上書きはセッションで共有し、クライアント自体は軽量なためテストごとに生成します。
+    認証とSupabaseクライアントは_override_dependenciesでスタブに差し替えられます。
+    """
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="session")
+def fake_embedding() -> list[float]:
+    """
+    テスト用のダミーembedding
+
+    import時に生成したリストを共有するため、テストごとに1536要素のリストを作り直しません。
+    読み取り専用として扱ってください。
+    """
+    return MOCK_RFP_EMBEDDING
+
+
+@pytest.fixture(scope="session")
+def mock_rfp_data() -> Mapping[str, Any]:
+    """テスト用のRFPデータ（読み取り専用、セッションで共有）"""
+    return MappingProxyType({
         "id": "rfp-test-123",
         "external_id": "ext-rfp-123",
         "title": "テストRFP案件",
@@ -104,11 +207,11 @@ def mock_rfp_data() -> dict:
         "deadline": "2025-12-31",
         "url": "https://example.com/rfp/123",
         "external_doc_urls": ["https://example.com/doc1.pdf"],
-        "embedding": [0.1] * 1536,  # ダミーのembedding
+        "embedding": MOCK_RFP_EMBEDDING,
         "created_at": "2025-01-01T00:00:00Z",
         "updated_at": "2025-01-01T00:00:00Z",
         "fetched_at": "2025-01-01T00:00:00Z",
-    }
+    })
 
 
 @pytest.fixture
@@ -122,10 +225,10 @@ def mock_bookmark_data(test_user_id: str) -> dict:
     }
 
 
-@pytest.fixture
-def mock_company_data(test_user_id: str) -> dict:
-    """テスト用の会社データ"""
-    return {
+@pytest.fixture(scope="session")
+def mock_company_data(test_user_id: str) -> Mapping[str, Any]:
+    """テスト用の会社データ（読み取り専用、セッションで共有）"""
+    return MappingProxyType({
         "id": "company-test-123",
         "user_id": test_user_id,
         "name": "テスト株式会社",
@@ -136,33 +239,50 @@ def mock_company_data(test_user_id: str) -> dict:
         "budget_min": 5000000,
         "budget_max": 50000000,
         "must_requirements": ["実績あり", "ISO認証"],
-        "embedding": [0.2] * 1536,
+        "embedding": MOCK_COMPANY_EMBEDDING,
         "created_at": "2025-01-01T00:00:00Z",
         "updated_at": "2025-01-01T00:00:00Z",
-    }
+    })
 
 
-@pytest.fixture
-def mock_match_snapshot_data() -> dict:
-    """テスト用のマッチングスナップショットデータ"""
-    return {
-        "company_id": "company-test-123",
+@pytest.fixture(scope="session")
+def mock_match_snapshot_data(test_user_id: str) -> Mapping[str, Any]:
+    """テスト用のマッチングスナップショットデータ（match_snapshotsテーブルの行、読み取り専用、セッションで共有）"""
+    return MappingProxyType({
+        "user_id": test_user_id,
         "rfp_id": "rfp-test-123",
-        "match_score": 85,
-        "must_requirements_ok": True,
-        "budget_match_ok": True,
-        "region_match_ok": True,
-        "match_factors": {
-            "semantic_similarity": 0.85,
-            "budget_match": 1.0,
-            "region_match": 1.0,
+        "score": 85,
+        "must_ok": True,
+        "budget_ok": True,
+        "region_ok": True,
+        "factors": {
+            "skill": 0.85,
+            "must": 1.0,
+            "budget": 1.0,
+            "deadline": 1.0,
+            "region": 1.0,
         },
         "summary_points": [
             "予算条件が適合しています",
             "地域条件が適合しています",
             "高いセマンティック類似度があります",
         ],
-        "updated_at": "2025-01-01T00:00:00Z",
+        "created_at": "2025-01-01T00:00:00Z",
+    })
+
+
+@pytest.fixture(scope="session")
+def match_with_rfp(
+    mock_match_snapshot_data: Mapping[str, Any], mock_rfp_data: Mapping[str, Any], fake_embedding: list[float]
+) -> dict:
+    """
+    テスト用のRFP情報を結合したマッチングスナップショットデータ（セッションで共有）
+
+    レスポンスのJSONとしてそのまま使えるようdictで返すため、テスト内で変更しないでください。
+    """
+    return {
+        **mock_match_snapshot_data,
+        "rfps": {**mock_rfp_data, "embedding": fake_embedding},  # has_embeddingの判定用
     }
 
 
@@ -173,3 +293,35 @@ def mock_match_snapshot_data() -> dict:
 pytest_plugins = [
     "tests.fixtures.rls_fixtures",
 ]
+
+
+# ============================================================================
+# RLSテストの実行制御
+# ============================================================================
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """RLSテストを実行するためのオプションを追加"""
+    parser.addoption(
+        "--run-rls",
+        action="store_true",
+        default=False,
+        help="実際のSupabaseに接続するRLSテスト（rlsマーカー）も実行する",
+    )
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]) -> None:
+    """
+    既定の実行ではRLSテストを選択対象から外す
+
+    RLSテストはネットワーク越しにユーザー作成・データ投入を行うため、`-m rls` などマーカー式を
+    指定した場合か、`--run-rls` を指定した場合のみ実行します。
+    addoptsに `-m "not rls"` を書くとpytest-testmonのテスト選択が無効になるため、フックで除外します。
+    """
+    if config.getoption("--run-rls") or config.getoption("markexpr"):
+        return
+
+    deselected = [item for item in items if item.get_closest_marker("rls") is not None]
+    if not deselected:
+        return
+
+    config.hook.pytest_deselected(items=deselected)
+    items[:] = [item for item in items if item.get_closest_marker("rls") is None]
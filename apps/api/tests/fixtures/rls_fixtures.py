@@ -5,14 +5,29 @@ RLSポリシーテスト用フィクスチャ
 """
 import os
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from typing import Generator, Dict, Any, Optional
 from datetime import datetime, timedelta
 
+import httpx
 import pytest
-from supabase import create_client, Client
+from supabase import create_client, Client, ClientOptions
 from supabase_auth.types import AuthResponse
 
 
+def vector_literal(value: float, dimensions: int = 1536) -> str:
+    """全要素が同じ値のベクトルをpgvectorのテキスト形式で生成"""
+    return "[" + ",".join([repr(value)] * dimensions) + "]"
+
+
+# テストデータのembedding（pgvectorのテキスト形式でimport時に1回だけ生成）
+_RFP_EMBEDDING = vector_literal(0.1)
+_COMPANY_SKILL_EMBEDDING = vector_literal(0.2)
+
+# RLSポリシー違反時にPostgRESTが返すエラーコード（insufficient_privilege）
+RLS_VIOLATION_CODE = "42501"
+
+
 class RlsTestUser:
     """
     RLSテストユーザー情報を保持するクラス
@@ -56,162 +71,344 @@ def supabase_service_key() -> str:
     return key
 
 
-@pytest.fixture(scope="function")
-def supabase_anon_client(supabase_url: str, supabase_anon_key: str) -> Generator[Client, None, None]:
+@pytest.fixture(scope="session")
+def supabase_http_client() -> Generator[httpx.Client, None, None]:
+    """
+    Supabaseクライアント間で共有するHTTPクライアント
+
+    コネクションプールを共有し、クライアントごとのTCP/TLSハンドシェイクを省きます。
+    HTTP/2を有効にし、auth・テーブル操作の小さなリクエストを1接続上で多重化します。
+    認証ヘッダーはリクエストごとに各Supabaseクライアントが付与するため、共有しても混在しません。
+    keepalive_expiryは既定の5秒だと時間のかかるテストの間に接続が閉じられるため、延ばしています。
+    """
+    client = httpx.Client(
+        http2=True,
+        follow_redirects=True,
+        limits=httpx.Limits(max_keepalive_connections=20, keepalive_expiry=60),
+    )
+    yield client
+    client.close()
+
+
+def _create_client(supabase_url: str, key: str, http_client: httpx.Client) -> Client:
+    """
+    共有HTTPクライアントを使用するSupabaseクライアントを作成
+
+    ClientOptionsはクライアントごとに状態（認証ヘッダー）を持つため、毎回新しく生成します。
+    """
+    return create_client(supabase_url, key, options=ClientOptions(httpx_client=http_client))
+
+
+@pytest.fixture(scope="session")
+def supabase_anon_client(
+    supabase_url: str, supabase_anon_key: str, supabase_http_client: httpx.Client
+) -> Generator[Client, None, None]:
     """
     Supabase匿名クライアント（RLS適用）
 
     一般ユーザーとして動作し、RLSポリシーが適用されます。
+    ログインしないため、セッション内で1つのクライアントを共有します。
+    未認証状態を前提とするテストがあるため、このクライアントでsign_in / sign_outしないでください。
     """
-    client = create_client(supabase_url, supabase_anon_key)
+    client = _create_client(supabase_url, supabase_anon_key, supabase_http_client)
     yield client
 
 
-@pytest.fixture(scope="function")
-def supabase_service_client(supabase_url: str, supabase_service_key: str) -> Generator[Client, None, None]:
+@pytest.fixture(scope="session")
+def supabase_service_client(
+    supabase_url: str, supabase_service_key: str, supabase_http_client: httpx.Client
+) -> Generator[Client, None, None]:
     """
     Supabase Service Roleクライアント（RLS無視）
 
     Service Roleとして動作し、RLSポリシーを無視してすべてのデータにアクセスできます。
     テストデータのセットアップとクリーンアップに使用します。
+    ステートレスなため、セッション内で1つのクライアントを共有します。
     """
-    client = create_client(supabase_url, supabase_service_key)
+    client = _create_client(supabase_url, supabase_service_key, supabase_http_client)
     yield client
 
 
-@pytest.fixture(scope="function")
-def test_user_1(supabase_anon_client: Client, supabase_service_client: Client) -> Generator[RlsTestUser, None, None]:
+# PYTEST_REUSE_DB=1 の場合、テストユーザーを実行をまたいで再利用する
+# （作成・削除のAdmin API往復を省略。ローカルで繰り返し実行する場合向け）
+_REUSE_TEST_USERS = os.getenv("PYTEST_REUSE_DB", "").lower() in ("1", "true", "yes")
+
+
+def _rls_test_user_email(label: str) -> str:
     """
-    テストユーザー1
+    テストユーザーのメールアドレスを生成
 
-    各テストで使用する主要なテストユーザー。
-    テスト実行後に自動的に削除されます。
+    Gmailのエイリアス機能を使用します。pytest-xdistのワーカーごとに別ユーザーとなるため、
+    どのワーカーのユーザーか分かるようにします。再利用モードでは実行をまたいで
+    同じユーザーを使うため、ランダムな接尾辞の代わりに固定値を付けます。
+
+    Args:
+        label: メールアドレスに含める識別子（例: "user1"）
+
+    Returns:
+        str: メールアドレス
     """
-    # ユニークなメールアドレスを生成（Gmailのエイリアス機能を使用）
-    unique_id = str(uuid.uuid4())[:8]
-    email = f"rfp-radar-test+user1-{unique_id}@gmail.com"
-    password = "test-password-123!Aa"
+    worker = os.getenv("PYTEST_XDIST_WORKER", "main")
+    suffix = "reuse" if _REUSE_TEST_USERS else str(uuid.uuid4())[:8]
+    return f"rfp-radar-test+{label}-{worker}-{suffix}@gmail.com"
 
-    user = None
-    # Service Roleクライアントで直接ユーザーを作成（メール確認をスキップ）
+
+def _find_reusable_test_user(
+    supabase_url: str, supabase_anon_key: str, http_client: httpx.Client, email: str, password: str
+) -> Optional[RlsTestUser]:
+    """
+    前回の実行で作成済みのテストユーザーをログインで探す
+
+    Args:
+        supabase_url: Supabase URL
+        supabase_anon_key: Supabase Anon Key
+        http_client: 共有HTTPクライアント
+        email: メールアドレス
+        password: パスワード
+
+    Returns:
+        Optional[RlsTestUser]: 見つかったユーザー（存在しない場合はNone）
+    """
+    client = _create_client(supabase_url, supabase_anon_key, http_client)
     try:
-        response = supabase_service_client.auth.admin.create_user({
-            "email": email,
-            "password": password,
-            "email_confirm": True  # メール確認済みとしてユーザーを作成
-        })
-
-        if not response.user:
-            pytest.fail("テストユーザー1の作成に失敗しました")
-
-        user = RlsTestUser(
-            email=email,
-            password=password,
-            user_id=response.user.id,
-            access_token=None  # 後でログインして取得
-        )
+        response = client.auth.sign_in_with_password({"email": email, "password": password})
+    except Exception:
+        return None
+    if not response.user:
+        return None
+
+    return RlsTestUser(email=email, password=password, user_id=response.user.id)
+
+
+def _create_rls_test_user(service_client: Client, label: str, password: str) -> RlsTestUser:
+    """
+    Service Roleでメール確認済みのテストユーザーを作成
 
-        yield user
+    Args:
+        service_client: Service Roleクライアント
+        label: メールアドレスに含める識別子（例: "user1"）
+        password: パスワード
 
-    finally:
-        # クリーンアップ: Service Roleでユーザーを削除
-        if user and user.user_id:
-            try:
-                # 会社IDを取得
-                company_response = supabase_service_client.table("companies").select("id").eq("user_id", user.user_id).execute()
-                company_id = company_response.data[0]["id"] if company_response.data else None
+    Returns:
+        RlsTestUser: 作成したユーザー
+    """
+    email = _rls_test_user_email(label)
 
-                # 関連データを削除（外部キー制約のある順序で削除）
-                if company_id:
-                    # company_idを参照するテーブルを先に削除
-                    supabase_service_client.table("company_skill_embeddings").delete().eq("company_id", company_id).execute()
-                    supabase_service_client.table("company_documents").delete().eq("company_id", company_id).execute()
+    # Service Roleクライアントで直接ユーザーを作成（メール確認をスキップ）
+    response = service_client.auth.admin.create_user({
+        "email": email,
+        "password": password,
+        "email_confirm": True  # メール確認済みとしてユーザーを作成
+    })
 
-                # user_idを参照するテーブルを削除
-                supabase_service_client.table("match_snapshots").delete().eq("user_id", user.user_id).execute()
-                supabase_service_client.table("bookmarks").delete().eq("user_id", user.user_id).execute()
-                supabase_service_client.table("companies").delete().eq("user_id", user.user_id).execute()
+    if not response.user:
+        pytest.fail(f"テストユーザー（{label}）の作成に失敗しました")
 
-                # ユーザーを削除（Supabase Admin APIを使用）
-                supabase_service_client.auth.admin.delete_user(user.user_id)
-            except Exception as e:
-                print(f"テストユーザー1のクリーンアップに失敗: {e}")
+    return RlsTestUser(
+        email=email,
+        password=password,
+        user_id=response.user.id,
+        access_token=None  # 後でログインして取得
+    )
 
 
-@pytest.fixture(scope="function")
-def test_user_2(supabase_anon_client: Client, supabase_service_client: Client) -> Generator[RlsTestUser, None, None]:
+# cleanup_test_user RPCが利用可能か（一度失敗したら以降はフォールバックのみ使用）
+_cleanup_rpc_available = True
+
+
+def _cleanup_via_rpc(service_client: Client, user_id: str, delete_user: bool) -> bool:
     """
-    テストユーザー2
+    cleanup_test_user RPCでテストユーザーのデータを1往復で削除
 
-    権限テストで「他のユーザー」として使用。
-    テスト実行後に自動的に削除されます。
+    Args:
+        service_client: Service Roleクライアント
+        user_id: ユーザーID
+        delete_user: ユーザー本体も削除するか
+
+    Returns:
+        bool: RPCで削除できた場合True（RPC未適用の環境などではFalse）
     """
-    # ユニークなメールアドレスを生成（Gmailのエイリアス機能を使用）
-    unique_id = str(uuid.uuid4())[:8]
-    email = f"rfp-radar-test+user2-{unique_id}@gmail.com"
-    password = "test-password-456!Aa"
+    global _cleanup_rpc_available
+    if not _cleanup_rpc_available:
+        return False
 
-    user = None
-    # Service Roleクライアントで直接ユーザーを作成（メール確認をスキップ）
     try:
-        response = supabase_service_client.auth.admin.create_user({
-            "email": email,
-            "password": password,
-            "email_confirm": True  # メール確認済みとしてユーザーを作成
-        })
-
-        if not response.user:
-            pytest.fail("テストユーザー2の作成に失敗しました")
-
-        user = RlsTestUser(
-            email=email,
-            password=password,
-            user_id=response.user.id,
-            access_token=None  # 後でログインして取得
-        )
+        service_client.rpc(
+            "cleanup_test_user", {"uid": user_id, "delete_user": delete_user}
+        ).execute()
+        return True
+    except Exception as e:
+        print(f"cleanup_test_user RPCが利用できないため個別に削除します: {e}")
+        _cleanup_rpc_available = False
+        return False
 
-        yield user
 
-    finally:
-        # クリーンアップ: Service Roleでユーザーを削除
-        if user and user.user_id:
-            try:
-                # 会社IDを取得
-                company_response = supabase_service_client.table("companies").select("id").eq("user_id", user.user_id).execute()
-                company_id = company_response.data[0]["id"] if company_response.data else None
+def _delete_user_rows(service_client: Client, user_id: str) -> None:
+    """
+    テストユーザーに紐づく行をService Roleで削除
 
-                # 関連データを削除（外部キー制約のある順序で削除）
-                if company_id:
-                    # company_idを参照するテーブルを先に削除
-                    supabase_service_client.table("company_skill_embeddings").delete().eq("company_id", company_id).execute()
-                    supabase_service_client.table("company_documents").delete().eq("company_id", company_id).execute()
+    Args:
+        service_client: Service Roleクライアント
+        user_id: ユーザーID
+    """
+    if not _cleanup_via_rpc(service_client, user_id, delete_user=False):
+        _delete_user_rows_individually(service_client, user_id)
 
-                # user_idを参照するテーブルを削除
-                supabase_service_client.table("match_snapshots").delete().eq("user_id", user.user_id).execute()
-                supabase_service_client.table("bookmarks").delete().eq("user_id", user.user_id).execute()
-                supabase_service_client.table("companies").delete().eq("user_id", user.user_id).execute()
 
-                # ユーザーを削除
-                supabase_service_client.auth.admin.delete_user(user.user_id)
-            except Exception as e:
-                print(f"テストユーザー2のクリーンアップに失敗: {e}")
+def _delete_user_rows_individually(service_client: Client, user_id: str) -> None:
+    """
+    テストユーザーに紐づく行をテーブルごとに削除（RPC未適用時のフォールバック）
 
+    Args:
+        service_client: Service Roleクライアント
+        user_id: ユーザーID
+    """
+    # 会社IDを取得
+    company_response = service_client.table("companies").select("id").eq("user_id", user_id).execute()
+    company_ids = [company["id"] for company in company_response.data or []]
 
-@pytest.fixture(scope="function")
-def authenticated_client_1(supabase_url: str, supabase_anon_key: str, test_user_1: RlsTestUser) -> Generator[Client, None, None]:
+    # 関連データを削除（外部キー制約のある順序で削除）
+    if company_ids:
+        # company_idを参照するテーブルを先に削除
+        service_client.table("company_skill_embeddings").delete().in_("company_id", company_ids).execute()
+        service_client.table("company_documents").delete().in_("company_id", company_ids).execute()
+
+    # user_idを参照するテーブルを削除
+    service_client.table("match_snapshots").delete().eq("user_id", user_id).execute()
+    service_client.table("bookmarks").delete().eq("user_id", user_id).execute()
+    service_client.table("companies").delete().eq("user_id", user_id).execute()
+
+
+def _delete_rls_test_user(service_client: Client, user: RlsTestUser) -> None:
     """
-    テストユーザー1で認証済みのSupabaseクライアント
+    テストユーザーと関連データを削除
 
-    RLSポリシーがtest_user_1の権限で適用されます。
+    Args:
+        service_client: Service Roleクライアント
+        user: 削除するユーザー
+    """
+    try:
+        if _cleanup_via_rpc(service_client, user.user_id, delete_user=True):
+            return
+
+        _delete_user_rows_individually(service_client, user.user_id)
+
+        # ユーザーを削除（Supabase Admin APIを使用）
+        service_client.auth.admin.delete_user(user.user_id)
+    except Exception as e:
+        print(f"テストユーザー（{user.email}）のクリーンアップに失敗: {e}")
+
+
+def _sign_in(
+    supabase_url: str, supabase_anon_key: str, http_client: httpx.Client, user: RlsTestUser
+) -> Client:
     """
-    client = create_client(supabase_url, supabase_anon_key)
+    指定ユーザーでログインしたクライアントを作成
+
+    Args:
+        supabase_url: Supabase URL
+        supabase_anon_key: Supabase Anon Key
+        http_client: 共有HTTPクライアント
+        user: ログインするユーザー
+
+    Returns:
+        Client: 認証済みクライアント
+    """
+    client = _create_client(supabase_url, supabase_anon_key, http_client)
 
     # ログイン
     client.auth.sign_in_with_password({
-        "email": test_user_1.email,
-        "password": test_user_1.password,
+        "email": user.email,
+        "password": user.password,
     })
 
+    return client
+
+
+# セッションで共有するテストユーザーの (識別子, パスワード)
+_SESSION_TEST_USER_SPECS = (
+    ("user1", "test-password-123!Aa"),
+    ("user2", "test-password-456!Aa"),
+)
+
+
+@pytest.fixture(scope="session")
+def session_test_users(
+    supabase_url: str,
+    supabase_anon_key: str,
+    supabase_http_client: httpx.Client,
+    supabase_service_client: Client,
+) -> Generator[tuple[RlsTestUser, ...], None, None]:
+    """
+    セッションで共有するテストユーザー一式
+
+    Admin APIでのユーザー作成は1件ごとにHTTPS往復が発生するため、
+    スレッドで並行に作成し、待ち時間を最も遅い1件分に抑えます。
+    ユーザーの作成・削除はセッションで1回だけ行います。
+
+    PYTEST_REUSE_DB=1 の場合は前回の実行で作成したユーザーを再利用し、
+    セッション終了時も削除しません（各テストの行データはtest_user_1/2が削除します）。
+    """
+    if _REUSE_TEST_USERS:
+        users = tuple(
+            _find_reusable_test_user(
+                supabase_url, supabase_anon_key, supabase_http_client, _rls_test_user_email(label), password
+            )
+            or _create_rls_test_user(supabase_service_client, label, password)
+            for label, password in _SESSION_TEST_USER_SPECS
+        )
+        yield users
+        return
+
+    with ThreadPoolExecutor(max_workers=len(_SESSION_TEST_USER_SPECS)) as executor:
+        futures = [
+            executor.submit(_create_rls_test_user, supabase_service_client, label, password)
+            for label, password in _SESSION_TEST_USER_SPECS
+        ]
+    # 一部だけ作成に成功した場合も後始末できるよう、全件の完了後に判定する
+    errors = [future.exception() for future in futures if future.exception() is not None]
+    users = tuple(future.result() for future in futures if future.exception() is None)
+    if errors:
+        for user in users:
+            _delete_rls_test_user(supabase_service_client, user)
+        raise errors[0]
+
+    yield users
+
+    with ThreadPoolExecutor(max_workers=len(users)) as executor:
+        list(executor.map(lambda user: _delete_rls_test_user(supabase_service_client, user), users))
+
+
+@pytest.fixture(scope="session")
+def session_test_user_1(session_test_users: tuple[RlsTestUser, ...]) -> RlsTestUser:
+    """
+    テストユーザー1（セッション共有）
+
+    テストごとのデータ削除はtest_user_1が担当します。
+    """
+    return session_test_users[0]
+
+
+@pytest.fixture(scope="session")
+def session_test_user_2(session_test_users: tuple[RlsTestUser, ...]) -> RlsTestUser:
+    """
+    テストユーザー2（セッション共有）
+
+    テストごとのデータ削除はtest_user_2が担当します。
+    """
+    return session_test_users[1]
+
+
+@pytest.fixture(scope="session")
+def session_authenticated_client_1(
+    supabase_url: str,
+    supabase_anon_key: str,
+    supabase_http_client: httpx.Client,
+    session_test_user_1: RlsTestUser,
+) -> Generator[Client, None, None]:
+    """テストユーザー1でログインしたクライアント（セッション共有）"""
+    client = _sign_in(supabase_url, supabase_anon_key, supabase_http_client, session_test_user_1)
+
     yield client
 
     # ログアウト
@@ -221,20 +418,15 @@ def authenticated_client_1(supabase_url: str, supabase_anon_key: str, test_user_
         pass
 
 
-@pytest.fixture(scope="function")
-def authenticated_client_2(supabase_url: str, supabase_anon_key: str, test_user_2: RlsTestUser) -> Generator[Client, None, None]:
-    """
-    テストユーザー2で認証済みのSupabaseクライアント
-
-    RLSポリシーがtest_user_2の権限で適用されます。
-    """
-    client = create_client(supabase_url, supabase_anon_key)
-
-    # ログイン
-    client.auth.sign_in_with_password({
-        "email": test_user_2.email,
-        "password": test_user_2.password,
-    })
+@pytest.fixture(scope="session")
+def session_authenticated_client_2(
+    supabase_url: str,
+    supabase_anon_key: str,
+    supabase_http_client: httpx.Client,
+    session_test_user_2: RlsTestUser,
+) -> Generator[Client, None, None]:
+    """テストユーザー2でログインしたクライアント（セッション共有）"""
+    client = _sign_in(supabase_url, supabase_anon_key, supabase_http_client, session_test_user_2)
 
     yield client
 
@@ -245,45 +437,182 @@ def authenticated_client_2(supabase_url: str, supabase_anon_key: str, test_user_
         pass
 
 
+@pytest.fixture(scope="function")
+def test_user_1(session_test_user_1: RlsTestUser, supabase_service_client: Client) -> Generator[RlsTestUser, None, None]:
+    """
+    テストユーザー1
+
+    各テストで使用する主要なテストユーザー。
+    ユーザー自体はセッションで共有し、テスト実行後に関連データを削除します。
+    """
+    yield session_test_user_1
+
+    try:
+        _delete_user_rows(supabase_service_client, session_test_user_1.user_id)
+    except Exception as e:
+        print(f"テストユーザー1のデータクリーンアップに失敗: {e}")
+
+
+@pytest.fixture(scope="function")
+def test_user_2(session_test_user_2: RlsTestUser, supabase_service_client: Client) -> Generator[RlsTestUser, None, None]:
+    """
+    テストユーザー2
+
+    権限テストで「他のユーザー」として使用。
+    ユーザー自体はセッションで共有し、テスト実行後に関連データを削除します。
+    """
+    yield session_test_user_2
+
+    try:
+        _delete_user_rows(supabase_service_client, session_test_user_2.user_id)
+    except Exception as e:
+        print(f"テストユーザー2のデータクリーンアップに失敗: {e}")
+
+
+@pytest.fixture(scope="function")
+def authenticated_client_1(session_authenticated_client_1: Client, test_user_1: RlsTestUser) -> Client:
+    """
+    テストユーザー1で認証済みのSupabaseクライアント
+
+    RLSポリシーがtest_user_1の権限で適用されます。
+    ログイン済みクライアントはセッションで共有し、test_user_1経由でテストごとにデータを削除します。
+    """
+    return session_authenticated_client_1
+
+
+@pytest.fixture(scope="function")
+def authenticated_client_2(session_authenticated_client_2: Client, test_user_2: RlsTestUser) -> Client:
+    """
+    テストユーザー2で認証済みのSupabaseクライアント
+
+    RLSポリシーがtest_user_2の権限で適用されます。
+    ログイン済みクライアントはセッションで共有し、test_user_2経由でテストごとにデータを削除します。
+    """
+    return session_authenticated_client_2
+
+
 # ===========================
 # テストデータ生成フィクスチャ
 # ===========================
 
+# seed_test_data RPCが利用可能か（一度失敗したら以降はフォールバックのみ使用）
+_seed_rpc_available = True
+
+# テストユーザー1の会社データ（user_id / company_idはシード時に付与）
+_COMPANY_USER_1_DATA = {
+    "name": "テスト株式会社1",
+    "description": "テストユーザー1の会社です",
+    "regions": ["東京都", "神奈川県"],
+    "budget_min": 5000000,
+    "budget_max": 50000000,
+    "skills": ["Python", "FastAPI", "PostgreSQL"],
+    "ng_keywords": ["NG1", "NG2"],
+}
+
+_COMPANY_DOCUMENT_USER_1_DATA = {
+    "title": "実績資料1",
+    "kind": "pdf",
+    "storage_path": "test/user1/document1.pdf",
+    "size_bytes": 1024000,
+    "tags": ["実績", "品質"],
+    "description": "テスト用の実績資料です",
+}
+
+_COMPANY_SKILL_EMBEDDING_USER_1_DATA = {
+    "skill_text": "Python, FastAPI, PostgreSQLを使用したシステム開発の実績があります。",
+    "embedding": _COMPANY_SKILL_EMBEDDING,
+}
+
+
+def _seed_via_rpc(service_client: Client, user_id: str, **rows: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    seed_test_data RPCで会社と関連データを1往復で作成
+
+    Args:
+        service_client: Service Roleクライアント
+        user_id: ユーザーID
+        **rows: company / company_document / company_skill_embedding の各行データ
+
+    Returns:
+        Optional[Dict[str, Any]]: 作成した行（RPC未適用の環境などではNone）
+    """
+    global _seed_rpc_available
+    if not _seed_rpc_available:
+        return None
+
+    try:
+        response = service_client.rpc("seed_test_data", {"uid": user_id, **rows}).execute()
+        return response.data
+    except Exception as e:
+        print(f"seed_test_data RPCが利用できないため個別に作成します: {e}")
+        _seed_rpc_available = False
+        return None
+
+
+def _insert_one(service_client: Client, table: str, row: Dict[str, Any]) -> Dict[str, Any]:
+    """1行をService Roleで作成して返す（RPC未適用時のフォールバック）"""
+    response = service_client.table(table).insert(row).execute()
+    if not response.data:
+        pytest.fail(f"{table}のテストデータの作成に失敗しました")
+    return response.data[0]
+
+
+def _seed_individually(service_client: Client, user_id: str, **rows: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    会社と関連データをテーブルごとに作成（RPC未適用時のフォールバック）
+
+    Args:
+        service_client: Service Roleクライアント
+        user_id: ユーザーID
+        **rows: company / company_document / company_skill_embedding の各行データ
+
+    Returns:
+        Dict[str, Any]: 作成した行
+    """
+    company = _insert_one(service_client, "companies", {**rows["company"], "user_id": user_id})
+    seeded = {"company": company, "company_document": None, "company_skill_embedding": None}
+    for key, table in (("company_document", "company_documents"),
+                       ("company_skill_embedding", "company_skill_embeddings")):
+        if rows.get(key) is not None:
+            seeded[key] = _insert_one(service_client, table, {**rows[key], "company_id": company["id"]})
+    return seeded
+
+
 @pytest.fixture(scope="function")
-def company_user_1(authenticated_client_1: Client, test_user_1: RlsTestUser) -> Generator[Dict[str, Any], None, None]:
+def seeded_data_user_1(supabase_service_client: Client, test_user_1: RlsTestUser) -> Dict[str, Any]:
     """
-    テストユーザー1の会社データを作成
+    テストユーザー1の会社・会社ドキュメント・スキル埋め込みを一括作成（Service Roleで作成）
 
-    テスト実行後に自動的に削除されます（CASCADE）。
+    seed_test_data RPCで1往復にまとめ、RPC未適用の環境ではテーブルごとに作成します。
+    テスト実行後のデータ削除はtest_user_1が担当します。
     """
-    company_data = {
-        "user_id": test_user_1.user_id,
-        "name": "テスト株式会社1",
-        "description": "テストユーザー1の会社です",
-        "regions": ["東京都", "神奈川県"],
-        "budget_min": 5000000,
-        "budget_max": 50000000,
-        "skills": ["Python", "FastAPI", "PostgreSQL"],
-        "ng_keywords": ["NG1", "NG2"],
+    rows = {
+        "company": _COMPANY_USER_1_DATA,
+        "company_document": _COMPANY_DOCUMENT_USER_1_DATA,
+        "company_skill_embedding": _COMPANY_SKILL_EMBEDDING_USER_1_DATA,
     }
+    seeded = _seed_via_rpc(supabase_service_client, test_user_1.user_id, **rows)
+    if seeded is None:
+        seeded = _seed_individually(supabase_service_client, test_user_1.user_id, **rows)
+    return seeded
 
-    response = authenticated_client_1.table("companies").insert(company_data).execute()
-
-    if not response.data or len(response.data) == 0:
-        pytest.fail("テストユーザー1の会社データの作成に失敗しました")
 
-    company = response.data[0]
-    yield company
+@pytest.fixture(scope="function")
+def company_user_1(seeded_data_user_1: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    テストユーザー1の会社データ
 
-    # クリーンアップはユーザー削除時にCASCADEで自動削除されるため不要
+    seeded_data_user_1で作成した会社を返します。
+    """
+    return seeded_data_user_1["company"]
 
 
 @pytest.fixture(scope="function")
-def company_user_2(authenticated_client_2: Client, test_user_2: RlsTestUser) -> Generator[Dict[str, Any], None, None]:
+def company_user_2(authenticated_client_2: Client, test_user_2: RlsTestUser) -> Dict[str, Any]:
     """
     テストユーザー2の会社データを作成
 
-    テスト実行後に自動的に削除されます（CASCADE）。
+    テスト実行後のデータ削除はtest_user_2が担当します。
     """
     company_data = {
         "user_id": test_user_2.user_id,
@@ -301,18 +630,17 @@ def company_user_2(authenticated_client_2: Client, test_user_2: RlsTestUser) ->
     if not response.data or len(response.data) == 0:
         pytest.fail("テストユーザー2の会社データの作成に失敗しました")
 
-    company = response.data[0]
-    yield company
-
-    # クリーンアップはユーザー削除時にCASCADEで自動削除されるため不要
+    return response.data[0]
 
 
-@pytest.fixture(scope="function")
+@pytest.fixture(scope="session")
 def rfp_data(supabase_service_client: Client) -> Generator[Dict[str, Any], None, None]:
     """
-    RFP案件データを作成（Service Roleで作成）
+    RFP案件データを作成（Service Roleで作成、セッションで共有）
 
-    テスト実行後に自動的に削除されます。
+    RFPはテストユーザーに紐づかず、テストごとのデータ削除の対象外のため、
+    セッションで1回だけ作成し、セッション終了時に削除します。
+    行を更新するテストは、テスト内で元の値に戻してください。
     """
     rfp = {
         "external_id": f"test-rfp-{uuid.uuid4()}",
@@ -324,7 +652,7 @@ def rfp_data(supabase_service_client: Client) -> Generator[Dict[str, Any], None,
         "deadline": (datetime.now() + timedelta(days=30)).strftime("%Y-%m-%d"),
         "url": "https://example.com/rfp/test",
         "external_doc_urls": ["https://example.com/doc1.pdf"],
-        "embedding": [0.1] * 1536,
+        "embedding": _RFP_EMBEDDING,
     }
 
     response = supabase_service_client.table("rfps").insert(rfp).execute()
@@ -343,39 +671,40 @@ def rfp_data(supabase_service_client: Client) -> Generator[Dict[str, Any], None,
 
 
 @pytest.fixture(scope="function")
-def company_document_user_1(authenticated_client_1: Client, company_user_1: Dict[str, Any]) -> Generator[Dict[str, Any], None, None]:
+def rfp_external_id_prefix(supabase_service_client: Client) -> Generator[str, None, None]:
     """
-    テストユーザー1の会社ドキュメントデータを作成
+    テスト内で作成するRFPのexternal_idに付けるプレフィックス
 
-    テスト実行後に自動的に削除されます（CASCADE）。
+    テスト実行後、このプレフィックスを持つRFPを1回のリクエストでまとめて削除します。
+    テストが途中で失敗しても削除されるため、テスト側でのクリーンアップは不要です。
     """
-    document_data = {
-        "company_id": company_user_1["id"],
-        "title": "実績資料1",
-        "kind": "pdf",
-        "storage_path": "test/user1/document1.pdf",
-        "size_bytes": 1024000,
-        "tags": ["実績", "品質"],
-        "description": "テスト用の実績資料です",
-    }
+    prefix = f"test-rls-{uuid.uuid4().hex[:8]}-"
 
-    response = authenticated_client_1.table("company_documents").insert(document_data).execute()
+    yield prefix
 
-    if not response.data or len(response.data) == 0:
-        pytest.fail("テストユーザー1の会社ドキュメントの作成に失敗しました")
+    # クリーンアップ
+    try:
+        supabase_service_client.table("rfps").delete().like("external_id", f"{prefix}%").execute()
+    except Exception as e:
+        print(f"RFPデータ（{prefix}*）のクリーンアップに失敗: {e}")
 
-    document = response.data[0]
-    yield document
 
-    # クリーンアップはユーザー削除時にCASCADEで自動削除されるため不要
+@pytest.fixture(scope="function")
+def company_document_user_1(seeded_data_user_1: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    テストユーザー1の会社ドキュメントデータ
+
+    seeded_data_user_1で会社と同時に作成したドキュメントを返します。
+    """
+    return seeded_data_user_1["company_document"]
 
 
 @pytest.fixture(scope="function")
-def bookmark_user_1(authenticated_client_1: Client, test_user_1: RlsTestUser, rfp_data: Dict[str, Any]) -> Generator[Dict[str, Any], None, None]:
+def bookmark_user_1(authenticated_client_1: Client, test_user_1: RlsTestUser, rfp_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     テストユーザー1のブックマークデータを作成
 
-    テスト実行後に自動的に削除されます（CASCADE）。
+    テスト実行後のデータ削除はtest_user_1が担当します。
     """
     bookmark_data = {
         "user_id": test_user_1.user_id,
@@ -387,10 +716,25 @@ def bookmark_user_1(authenticated_client_1: Client, test_user_1: RlsTestUser, rf
     if not response.data or len(response.data) == 0:
         pytest.fail("テストユーザー1のブックマークの作成に失敗しました")
 
-    bookmark = response.data[0]
-    yield bookmark
+    return response.data[0]
+
+
+@pytest.fixture(scope="function")
+def bookmark_user_2(authenticated_client_2: Client, test_user_2: RlsTestUser, rfp_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    テストユーザー2のブックマークデータを作成
+
+    テスト実行後のデータ削除はtest_user_2が担当します。
+    """
+    response = authenticated_client_2.table("bookmarks").insert({
+        "user_id": test_user_2.user_id,
+        "rfp_id": rfp_data["id"],
+    }).execute()
+
+    if not response.data or len(response.data) == 0:
+        pytest.fail("テストユーザー2のブックマークの作成に失敗しました")
 
-    # クリーンアップはユーザー削除時にCASCADEで自動削除されるため不要
+    return response.data[0]
 
 
 @pytest.fixture(scope="function")
@@ -433,28 +777,10 @@ def match_snapshot_user_1(supabase_service_client: Client, test_user_1: RlsTestU
 
 
 @pytest.fixture(scope="function")
-def company_skill_embedding_user_1(supabase_service_client: Client, company_user_1: Dict[str, Any]) -> Generator[Dict[str, Any], None, None]:
+def company_skill_embedding_user_1(seeded_data_user_1: Dict[str, Any]) -> Dict[str, Any]:
     """
-    テストユーザー1の会社スキル埋め込みデータを作成（Service Roleで作成）
+    テストユーザー1の会社スキル埋め込みデータ
 
-    テスト実行後に自動的に削除されます。
+    seeded_data_user_1で会社と同時に作成した埋め込みを返します。
     """
-    embedding_data = {
-        "company_id": company_user_1["id"],
-        "skill_text": "Python, FastAPI, PostgreSQLを使用したシステム開発の実績があります。",
-        "embedding": [0.2] * 1536,
-    }
-
-    response = supabase_service_client.table("company_skill_embeddings").insert(embedding_data).execute()
-
-    if not response.data or len(response.data) == 0:
-        pytest.fail("テストユーザー1の会社スキル埋め込みの作成に失敗しました")
-
-    embedding = response.data[0]
-    yield embedding
-
-    # クリーンアップ
-    try:
-        supabase_service_client.table("company_skill_embeddings").delete().eq("id", embedding["id"]).execute()
-    except Exception as e:
-        print(f"会社スキル埋め込みのクリーンアップに失敗: {e}")
+    return seeded_data_user_1["company_skill_embedding"]
@@ -4,62 +4,32 @@
 ブックマークの作成、削除、一覧取得をテストします。
 """
 import pytest
-from unittest.mock import MagicMock
 from fastapi import status
-from fastapi.testclient import TestClient
+from httpx import AsyncClient
+
+from tests.conftest import TEST_USER_ID, FakeSupabase, FakeSupabaseResponse
 
 
 @pytest.mark.unit
 class TestCreateBookmark:
     """ブックマーク作成APIのテストクラス"""
 
-    def test_ブックマーク作成_正常系(
+    async def test_ブックマーク作成_正常系(
         self,
-        client: TestClient,
-        mock_supabase_client: MagicMock,
+        async_client: AsyncClient,
+        fake_supabase: FakeSupabase,
         mock_rfp_data: dict,
         mock_bookmark_data: dict,
     ):
         """ブックマークが正常に作成されることを確認"""
-        # RFP存在確認のモック
-        rfp_response = MagicMock()
-        rfp_response.data = [{"id": mock_rfp_data["id"]}]
-
-        # 既存ブックマークチェックのモック（存在しない）
-        existing_bookmark_response = MagicMock()
-        existing_bookmark_response.data = []
-
-        # ブックマーク作成のモック
-        create_response = MagicMock()
-        create_response.data = [mock_bookmark_data]
-
-        # モックの設定（詳細なチェーンメソッドの設定）
-        mock_table = mock_supabase_client.table.return_value
-
-        # RFP存在確認のチェーン
-        rfp_select = MagicMock()
-        rfp_eq = MagicMock()
-        rfp_eq.execute.return_value = rfp_response
-        rfp_select.eq.return_value = rfp_eq
-
-        # 既存ブックマークチェックのチェーン
-        bookmark_select = MagicMock()
-        bookmark_eq1 = MagicMock()
-        bookmark_eq2 = MagicMock()
-        bookmark_eq2.execute.return_value = existing_bookmark_response
-        bookmark_eq1.eq.return_value = bookmark_eq2
-        bookmark_select.eq.return_value = bookmark_eq1
-
-        # selectメソッドの呼び出しごとに適切なモックを返す
-        mock_table.select.side_effect = [rfp_select, bookmark_select]
-
-        # insertのチェーン
-        mock_insert = MagicMock()
-        mock_insert.execute.return_value = create_response
-        mock_table.insert.return_value = mock_insert
+        # RFPは存在、埋め込みの既存ブックマークはなし → 作成
+        fake_supabase.queue(
+            FakeSupabaseResponse([{"id": mock_rfp_data["id"], "bookmarks": []}]),
+            FakeSupabaseResponse([mock_bookmark_data]),
+        )
 
         # APIリクエスト
-        response = client.post(
+        response = await async_client.post(
             "/api/bookmarks",
             json={"rfp_id": mock_rfp_data["id"]},
         )
@@ -70,55 +40,42 @@ class TestCreateBookmark:
         assert data["id"] == mock_bookmark_data["id"]
         assert data["rfp_id"] == mock_bookmark_data["rfp_id"]
         assert data["user_id"] == mock_bookmark_data["user_id"]
+        assert fake_supabase.tables == ["rfps", "bookmarks"]
 
-    def test_ブックマーク作成_RFPが存在しない(
+    async def test_ブックマーク作成_RFPが存在しない(
         self,
-        client: TestClient,
-        mock_supabase_client: MagicMock,
+        async_client: AsyncClient,
+        fake_supabase: FakeSupabase,
     ):
         """存在しないRFPに対してブックマーク作成時に404エラーが返されることを確認"""
         # RFP存在確認のモック（存在しない）
-        rfp_response = MagicMock()
-        rfp_response.data = []
-
-        mock_table = mock_supabase_client.table.return_value
-        mock_table.select.return_value.eq.return_value.execute.return_value = rfp_response
+        fake_supabase.queue(FakeSupabaseResponse([]))
 
         # APIリクエスト
-        response = client.post(
+        response = await async_client.post(
             "/api/bookmarks",
             json={"rfp_id": "non-existent-rfp-id"},
         )
 
         # レスポンス検証
         assert response.status_code == status.HTTP_404_NOT_FOUND
-        assert "指定されたRFPが見つかりません" in response.json()["detail"]
+        assert "指定されたRFPが見つかりません" in response.json()["error"]["message"]
 
-    def test_ブックマーク作成_既に存在する場合は既存のものを返却_冪等性(
+    async def test_ブックマーク作成_既に存在する場合は既存のものを返却_冪等性(
         self,
-        client: TestClient,
-        mock_supabase_client: MagicMock,
+        async_client: AsyncClient,
+        fake_supabase: FakeSupabase,
         mock_rfp_data: dict,
         mock_bookmark_data: dict,
     ):
         """既にブックマーク済みの場合、既存のブックマークを返却することを確認（冪等性）"""
-        # RFP存在確認のモック
-        rfp_response = MagicMock()
-        rfp_response.data = [{"id": mock_rfp_data["id"]}]
-
-        # 既存ブックマークチェックのモック（存在する）
-        existing_bookmark_response = MagicMock()
-        existing_bookmark_response.data = [mock_bookmark_data]
-
-        # モックの設定
-        mock_table = mock_supabase_client.table.return_value
-        mock_table.select.return_value.eq.return_value.execute.side_effect = [
-            rfp_response,  # RFP存在確認
-            existing_bookmark_response,  # 既存ブックマークチェック
-        ]
+        # RFPの存在確認と既存ブックマークは1回のクエリで返る
+        fake_supabase.queue(
+            FakeSupabaseResponse([{"id": mock_rfp_data["id"], "bookmarks": [mock_bookmark_data]}]),
+        )
 
         # APIリクエスト
-        response = client.post(
+        response = await async_client.post(
             "/api/bookmarks",
             json={"rfp_id": mock_rfp_data["id"]},
         )
@@ -129,97 +86,104 @@ class TestCreateBookmark:
         assert data["id"] == mock_bookmark_data["id"]
         assert data["rfp_id"] == mock_bookmark_data["rfp_id"]
 
-        # insertが呼ばれていないことを確認（既存のものを返却）
-        mock_table.insert.assert_not_called()
+        # 問い合わせはrfpsへの1回のみで、insertは呼ばれていないことを確認（既存のものを返却）
+        assert fake_supabase.tables == ["rfps"]
+        # 埋め込みのブックマークは認証ユーザーのものに絞り込まれていることを確認
+        assert ("rfps", "eq", ("bookmarks.user_id", TEST_USER_ID), {}) in fake_supabase.calls
+
+    async def test_ブックマーク作成_他のユーザーのブックマークは重複とみなさない(
+        self,
+        async_client: AsyncClient,
+        fake_supabase: FakeSupabase,
+        mock_rfp_data: dict,
+        mock_bookmark_data: dict,
+    ):
+        """他のユーザーが同じRFPをブックマーク済みでも、自分のブックマークが作成されることを確認"""
+        # 他のユーザーのブックマークは埋め込みのフィルタで除外され、空で返る
+        fake_supabase.queue(
+            FakeSupabaseResponse([{"id": mock_rfp_data["id"], "bookmarks": []}]),
+            FakeSupabaseResponse([mock_bookmark_data]),
+        )
+
+        # APIリクエスト
+        response = await async_client.post(
+            "/api/bookmarks",
+            json={"rfp_id": mock_rfp_data["id"]},
+        )
+
+        # レスポンス検証（既存のものを返却せず、新規に作成している）
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.json()["user_id"] == TEST_USER_ID
+        assert ("rfps", "eq", ("bookmarks.user_id", TEST_USER_ID), {}) in fake_supabase.calls
+        insert_data = {"user_id": TEST_USER_ID, "rfp_id": mock_rfp_data["id"]}
+        assert ("bookmarks", "insert", (insert_data,), {}) in fake_supabase.calls
 
 
 @pytest.mark.unit
 class TestDeleteBookmark:
     """ブックマーク削除APIのテストクラス"""
 
-    def test_ブックマーク削除_正常系(
+    async def test_ブックマーク削除_正常系(
         self,
-        client: TestClient,
-        mock_supabase_client: MagicMock,
+        async_client: AsyncClient,
+        fake_supabase: FakeSupabase,
         mock_bookmark_data: dict,
     ):
         """ブックマークが正常に削除されることを確認"""
-        # ブックマーク存在確認のモック
-        bookmark_response = MagicMock()
-        bookmark_response.data = [{"id": mock_bookmark_data["id"]}]
-
-        # 削除レスポンスのモック
-        delete_response = MagicMock()
-        delete_response.data = []
-
-        # モックの設定
-        mock_table = mock_supabase_client.table.return_value
-        mock_table.select.return_value.eq.return_value.eq.return_value.execute.return_value = (
-            bookmark_response
-        )
-        mock_table.delete.return_value.eq.return_value.eq.return_value.execute.return_value = (
-            delete_response
+        # ブックマーク存在確認、削除の順に応答する
+        fake_supabase.queue(
+            FakeSupabaseResponse([{"id": mock_bookmark_data["id"]}]),
+            FakeSupabaseResponse([]),
         )
 
         # APIリクエスト
-        response = client.delete(f"/api/bookmarks/{mock_bookmark_data['id']}")
+        response = await async_client.delete(f"/api/bookmarks/{mock_bookmark_data['id']}")
 
         # レスポンス検証
         assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert ("bookmarks", "delete", (), {}) in fake_supabase.calls
 
-    def test_ブックマーク削除_存在しない(
+    async def test_ブックマーク削除_存在しない(
         self,
-        client: TestClient,
-        mock_supabase_client: MagicMock,
+        async_client: AsyncClient,
+        fake_supabase: FakeSupabase,
     ):
         """存在しないブックマークの削除時に404エラーが返されることを確認"""
         # ブックマーク存在確認のモック（存在しない）
-        bookmark_response = MagicMock()
-        bookmark_response.data = []
-
-        mock_table = mock_supabase_client.table.return_value
-        mock_table.select.return_value.eq.return_value.eq.return_value.execute.return_value = (
-            bookmark_response
-        )
+        fake_supabase.queue(FakeSupabaseResponse([]))
 
         # APIリクエスト
-        response = client.delete("/api/bookmarks/non-existent-bookmark-id")
+        response = await async_client.delete("/api/bookmarks/non-existent-bookmark-id")
 
         # レスポンス検証
         assert response.status_code == status.HTTP_404_NOT_FOUND
-        assert "ブックマークが見つかりません" in response.json()["detail"]
+        assert "ブックマークが見つかりません" in response.json()["error"]["message"]
 
-    def test_ブックマーク削除_他のユーザーのブックマークは削除できない(
+    async def test_ブックマーク削除_他のユーザーのブックマークは削除できない(
         self,
-        client: TestClient,
-        mock_supabase_client: MagicMock,
+        async_client: AsyncClient,
+        fake_supabase: FakeSupabase,
     ):
         """他のユーザーのブックマークは削除できないことを確認"""
         # ブックマーク存在確認のモック（他のユーザーのもの = 検索結果に含まれない）
-        bookmark_response = MagicMock()
-        bookmark_response.data = []
-
-        mock_table = mock_supabase_client.table.return_value
-        mock_table.select.return_value.eq.return_value.eq.return_value.execute.return_value = (
-            bookmark_response
-        )
+        fake_supabase.queue(FakeSupabaseResponse([]))
 
         # APIリクエスト
-        response = client.delete("/api/bookmarks/other-user-bookmark-id")
+        response = await async_client.delete("/api/bookmarks/other-user-bookmark-id")
 
         # レスポンス検証
         assert response.status_code == status.HTTP_404_NOT_FOUND
-        assert "ブックマークが見つかりません" in response.json()["detail"]
+        assert "ブックマークが見つかりません" in response.json()["error"]["message"]
 
 
 @pytest.mark.unit
 class TestGetBookmarks:
     """ブックマーク一覧取得APIのテストクラス"""
 
-    def test_ブックマーク一覧取得_正常系(
+    async def test_ブックマーク一覧取得_正常系(
         self,
-        client: TestClient,
-        mock_supabase_client: MagicMock,
+        async_client: AsyncClient,
+        fake_supabase: FakeSupabase,
         mock_bookmark_data: dict,
         mock_rfp_data: dict,
     ):
@@ -234,18 +198,13 @@ class TestGetBookmarks:
         }
 
         # モックレスポンス
-        list_response = MagicMock()
-        list_response.data = [bookmark_with_rfp]
-        list_response.count = 1
+        list_response = FakeSupabaseResponse([bookmark_with_rfp], count=1)
 
         # モックの設定
-        mock_table = mock_supabase_client.table.return_value
-        mock_table.select.return_value.eq.return_value.order.return_value.range.return_value.execute.return_value = (
-            list_response
-        )
+        fake_supabase.queue(list_response)
 
         # APIリクエスト
-        response = client.get("/api/bookmarks?page=1&page_size=20")
+        response = await async_client.get("/api/bookmarks?page=1&page_size=20")
 
         # レスポンス検証
         assert response.status_code == status.HTTP_200_OK
@@ -257,25 +216,20 @@ class TestGetBookmarks:
         assert data["items"][0]["id"] == mock_bookmark_data["id"]
         assert data["items"][0]["rfp"]["id"] == mock_rfp_data["id"]
 
-    def test_ブックマーク一覧取得_空リスト(
+    async def test_ブックマーク一覧取得_空リスト(
         self,
-        client: TestClient,
-        mock_supabase_client: MagicMock,
+        async_client: AsyncClient,
+        fake_supabase: FakeSupabase,
     ):
         """ブックマークが存在しない場合、空リストが返されることを確認"""
         # モックレスポンス（空）
-        list_response = MagicMock()
-        list_response.data = []
-        list_response.count = 0
+        list_response = FakeSupabaseResponse([], count=0)
 
         # モックの設定
-        mock_table = mock_supabase_client.table.return_value
-        mock_table.select.return_value.eq.return_value.order.return_value.range.return_value.execute.return_value = (
-            list_response
-        )
+        fake_supabase.queue(list_response)
 
         # APIリクエスト
-        response = client.get("/api/bookmarks")
+        response = await async_client.get("/api/bookmarks")
 
         # レスポンス検証
         assert response.status_code == status.HTTP_200_OK
@@ -283,10 +237,10 @@ class TestGetBookmarks:
         assert data["total"] == 0
         assert len(data["items"]) == 0
 
-    def test_ブックマーク一覧取得_ページネーション(
+    async def test_ブックマーク一覧取得_ページネーション(
         self,
-        client: TestClient,
-        mock_supabase_client: MagicMock,
+        async_client: AsyncClient,
+        fake_supabase: FakeSupabase,
         mock_bookmark_data: dict,
         mock_rfp_data: dict,
     ):
@@ -297,20 +251,13 @@ class TestGetBookmarks:
             "rfps": {**mock_rfp_data, "has_embedding": True},
         }
 
-        list_response = MagicMock()
-        list_response.data = [bookmark_with_rfp]
-        list_response.count = 50  # 合計50件
+        list_response = FakeSupabaseResponse([bookmark_with_rfp], count=50)  # 合計50件
 
         # モックの設定
-        mock_table = mock_supabase_client.table.return_value
-        mock_select = mock_table.select.return_value
-        mock_eq = mock_select.eq.return_value
-        mock_order = mock_eq.order.return_value
-        mock_range = mock_order.range
-        mock_range.return_value.execute.return_value = list_response
+        fake_supabase.queue(list_response)
 
         # APIリクエスト（2ページ目、10件ずつ）
-        response = client.get("/api/bookmarks?page=2&page_size=10")
+        response = await async_client.get("/api/bookmarks?page=2&page_size=10")
 
         # レスポンス検証
         assert response.status_code == status.HTTP_200_OK
@@ -321,4 +268,4 @@ class TestGetBookmarks:
 
         # rangeメソッドが正しいオフセットで呼ばれたことを確認
         # page=2, page_size=10 → offset=10, range(10, 19)
-        mock_range.assert_called_once_with(10, 19)
+        assert ("bookmarks", "range", (10, 19), {}) in fake_supabase.calls
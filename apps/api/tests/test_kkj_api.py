@@ -0,0 +1,263 @@
+"""
+KKJ APIクライアントのテストケース
+
+XMLレスポンスのパースと、都道府県ごとのRFP一括取得をテストします。
+"""
+import logging
+import threading
+import time
+import xml.etree.ElementTree as ET
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from pytest_httpx import HTTPXMock
+
+from services import kkj_api
+from services.kkj_api import KKJAPIClient
+
+# 検索結果が0件のXMLレスポンス
+EMPTY_RESULTS_XML = (
+    "<Results><SearchResults><SearchHits>0</SearchHits></SearchResults></Results>"
+)
+
+
+@pytest.fixture
+def kkj_client() -> KKJAPIClient:
+    """レート制限の待機を無効にしたKKJ APIクライアント"""
+    client = KKJAPIClient()
+    client.rate_limit_delay = 0.0
+    return client
+
+
+@pytest.mark.unit
+class TestParseXmlResponse:
+    """_parse_xml_responseのテストクラス"""
+
+    def test_パース_複数の検索結果(self, kkj_client: KKJAPIClient):
+        """複数のSearchResult要素を文書順にパースすることを確認"""
+        xml = """<?xml version="1.0" encoding="UTF-8"?>
+        <Results>
+          <SearchResults>
+            <SearchHits>2</SearchHits>
+            <SearchResult>
+              <Key>key-1</Key>
+              <ProjectName>案件1</ProjectName>
+              <OrganizationName>東京都</OrganizationName>
+              <LgCode>13</LgCode>
+            </SearchResult>
+            <SearchResult>
+              <Key>key-2</Key>
+              <ProjectName>  案件2  </ProjectName>
+              <LgCode>27</LgCode>
+            </SearchResult>
+          </SearchResults>
+        </Results>
+        """
+
+        rfps = kkj_client._parse_xml_response(xml)
+
+        assert [rfp["key"] for rfp in rfps] == ["key-1", "key-2"]
+        assert rfps[0]["project_name"] == "案件1"
+        assert rfps[0]["organization_name"] == "東京都"
+        assert rfps[0]["prefecture_name"] == "東京都"
+        # 前後の空白は除去され、存在しない要素は空文字になる
+        assert rfps[1]["project_name"] == "案件2"
+        assert rfps[1]["organization_name"] == ""
+        assert rfps[1]["prefecture_name"] == "大阪府"
+        assert rfps[1]["attachments"] == []
+
+    def test_パース_添付ファイル(self, kkj_client: KKJAPIClient):
+        """Attachments配下のAttachment要素から名前とURIを取得することを確認"""
+        xml = """
+        <Results>
+          <SearchResults>
+            <SearchResult>
+              <Key>key-1</Key>
+              <Attachments>
+                <Attachment>
+                  <Name>仕様書</Name>
+                  <Uri>https://example.com/spec.pdf</Uri>
+                </Attachment>
+                <Attachment>
+                  <Name>図面</Name>
+                  <Uri>https://example.com/drawing.pdf</Uri>
+                </Attachment>
+              </Attachments>
+            </SearchResult>
+          </SearchResults>
+        </Results>
+        """
+
+        rfps = kkj_client._parse_xml_response(xml)
+
+        assert rfps[0]["attachments"] == [
+            {"name": "仕様書", "uri": "https://example.com/spec.pdf"},
+            {"name": "図面", "uri": "https://example.com/drawing.pdf"},
+        ]
+
+    def test_パース_ヒット件数をログ出力(
+        self, kkj_client: KKJAPIClient, caplog: pytest.LogCaptureFixture
+    ):
+        """SearchHitsの件数をログに出力することを確認"""
+        with caplog.at_level(logging.INFO, logger="services.kkj_api"):
+            rfps = kkj_client._parse_xml_response(
+                "<Results><SearchResults><SearchHits>42</SearchHits></SearchResults></Results>"
+            )
+
+        assert rfps == []
+        assert "検索ヒット件数: 42" in caplog.text
+
+    def test_パース_SearchResults要素なし(
+        self, kkj_client: KKJAPIClient, caplog: pytest.LogCaptureFixture
+    ):
+        """SearchResults要素がない場合、警告を出して空リストを返すことを確認"""
+        with caplog.at_level(logging.WARNING, logger="services.kkj_api"):
+            rfps = kkj_client._parse_xml_response("<Results></Results>")
+
+        assert rfps == []
+        assert "SearchResults要素が見つかりません" in caplog.text
+
+    @pytest.mark.parametrize(
+        ("xml", "expected_message"),
+        [
+            pytest.param(
+                "<Results><Error>Invalid parameter</Error></Results>",
+                "KKJ APIエラー: Invalid parameter",
+                id="エラーメッセージあり",
+            ),
+            pytest.param(
+                "<Results><Error></Error></Results>",
+                "KKJ APIエラー: 不明なエラー",
+                id="エラーメッセージなし",
+            ),
+        ],
+    )
+    def test_パース_エラーレスポンス(
+        self, kkj_client: KKJAPIClient, xml: str, expected_message: str
+    ):
+        """Error要素を含むレスポンスはValueErrorになることを確認"""
+        with pytest.raises(ValueError, match=expected_message):
+            kkj_client._parse_xml_response(xml)
+
+    def test_パース_不正なXML(self, kkj_client: KKJAPIClient):
+        """不正な形式のXMLはParseErrorになることを確認"""
+        with pytest.raises(ET.ParseError):
+            kkj_client._parse_xml_response("<Results><SearchResults>")
+
+
+@pytest.mark.unit
+class TestFetchRfpsBulk:
+    """fetch_rfps_bulkのテストクラス"""
+
+    def test_一括取得_重複した都道府県コードは1回だけ取得(
+        self, kkj_client: KKJAPIClient, monkeypatch: pytest.MonkeyPatch
+    ):
+        """重複した都道府県コードは1回だけ取得し、指定順に結果を返すことを確認"""
+        called: list[str] = []
+        lock = threading.Lock()
+
+        def fake_fetch_rfps(prefecture_code: str, **kwargs):
+            with lock:
+                called.append(prefecture_code)
+            return [{"lg_code": prefecture_code}]
+
+        monkeypatch.setattr(kkj_client, "fetch_rfps", fake_fetch_rfps)
+
+        results, errors = kkj_client.fetch_rfps_bulk(["13", "27", "13"])
+
+        assert sorted(called) == ["13", "27"]
+        assert list(results) == ["13", "27"]
+        assert results["13"] == [{"lg_code": "13"}]
+        assert errors == {}
+
+    def test_一括取得_空リスト(
+        self, kkj_client: KKJAPIClient, monkeypatch: pytest.MonkeyPatch
+    ):
+        """都道府県コードが空の場合、APIを呼ばずに空の結果を返すことを確認"""
+        def fake_fetch_rfps(prefecture_code: str, **kwargs):
+            raise AssertionError("fetch_rfpsは呼ばれない想定")
+
+        monkeypatch.setattr(kkj_client, "fetch_rfps", fake_fetch_rfps)
+
+        assert kkj_client.fetch_rfps_bulk([]) == ({}, {})
+
+    def test_一括取得_一部の都道府県が失敗(
+        self, kkj_client: KKJAPIClient, monkeypatch: pytest.MonkeyPatch
+    ):
+        """失敗した都道府県は例外とともに返し、他の都道府県の結果は返すことを確認"""
+        error = httpx.ConnectError("connection refused")
+
+        def fake_fetch_rfps(prefecture_code: str, **kwargs):
+            if prefecture_code == "13":
+                raise error
+            return [{"lg_code": prefecture_code}]
+
+        monkeypatch.setattr(kkj_client, "fetch_rfps", fake_fetch_rfps)
+
+        results, errors = kkj_client.fetch_rfps_bulk(["13", "27", "01"])
+
+        assert list(results) == ["27", "01"]
+        assert errors == {"13": error}
+
+    def test_一括取得_無効な都道府県コード(self, kkj_client: KKJAPIClient):
+        """無効な都道府県コードが含まれる場合、ValueErrorが発生することを確認"""
+        with pytest.raises(ValueError, match="無効な都道府県コード: 99"):
+            kkj_client.fetch_rfps_bulk(["13", "99"])
+
+    def test_一括取得_同時実行数の上限(
+        self, kkj_client: KKJAPIClient, monkeypatch: pytest.MonkeyPatch
+    ):
+        """同時に実行されるfetch_rfpsがmax_concurrency件を超えないことを確認"""
+        lock = threading.Lock()
+        active = 0
+        peak = 0
+
+        def fake_fetch_rfps(prefecture_code: str, **kwargs):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.05)
+            with lock:
+                active -= 1
+            return []
+
+        monkeypatch.setattr(kkj_client, "fetch_rfps", fake_fetch_rfps)
+
+        results, errors = kkj_client.fetch_rfps_bulk(
+            ["01", "02", "03", "04", "05"], max_concurrency=2
+        )
+
+        assert len(results) == 5
+        assert errors == {}
+        assert peak == 2
+
+    def test_一括取得_リクエストの開始間隔はレート制限に従う(
+        self,
+        kkj_client: KKJAPIClient,
+        httpx_mock: HTTPXMock,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        """並行取得でもリクエストの開始がrate_limit_delayずつずらされることを確認"""
+        # スレッドの起床タイミングに左右されないよう、sleepで進む仮の時計を使う
+        clock = {"now": 100.0}
+        sleeps: list[float] = []
+
+        def fake_sleep(seconds: float) -> None:
+            sleeps.append(seconds)
+            clock["now"] += seconds
+
+        monkeypatch.setattr(
+            kkj_api, "time", SimpleNamespace(monotonic=lambda: clock["now"], sleep=fake_sleep)
+        )
+        kkj_client.rate_limit_delay = 1.0
+        httpx_mock.add_response(text=EMPTY_RESULTS_XML, is_reusable=True)
+
+        results, errors = kkj_client.fetch_rfps_bulk(["01", "02", "03"], max_concurrency=3)
+
+        assert len(results) == 3
+        assert errors == {}
+        # 同時に開始した3件のうち、2件目と3件目はそれぞれ1秒ずつ待機する
+        assert sleeps == [1.0, 1.0]
+        assert len(httpx_mock.get_requests()) == 3
@@ -3,14 +3,76 @@ ProposalGeneratorサービスのテストケース
 
 提案書生成サービスの単体テストを行います。
 """
+import copy
+import types
+
 import pytest
 from datetime import date, datetime
 from pathlib import Path
+from unittest.mock import MagicMock
 from jinja2 import TemplateNotFound
 
 from services.proposal_generator import ProposalGenerator
 
 
+# 提案書生成テストの基準データ（読み取り専用。変更が必要なテストはフィクスチャ経由でコピーを使う）
+BASE_RFP_DATA = types.MappingProxyType({
+    "id": "rfp-test-123",
+    "title": "テストRFP案件",
+    "issuing_org": "テスト組織",
+    "description": "これはテスト用のRFP案件です。詳細な説明がここに入ります。",
+    "budget": 10000000,
+    "region": "東京都",
+    "deadline": "2025-12-31",
+    "url": "https://example.com/rfp/123",
+    "external_doc_urls": ["https://example.com/doc1.pdf", "https://example.com/doc2.pdf"],
+})
+
+BASE_COMPANY_DATA = types.MappingProxyType({
+    "id": "company-test-123",
+    "name": "テスト株式会社",
+    "description": "テスト用の会社です",
+    "skills": ["Python", "FastAPI", "React", "TypeScript", "PostgreSQL"],
+    "regions": ["東京都", "神奈川県"],
+})
+
+
+@pytest.fixture(scope="session")
+def proposal_generator() -> ProposalGenerator:
+    """
+    セッションで共有するProposalGenerator
+
+    Jinja2環境の構築とテンプレートのコンパイルをセッションで1回にまとめます。
+    初期化処理そのもののテストはTestProposalGeneratorInitで個別に生成します。
+    """
+    return ProposalGenerator()
+
+
+@pytest.fixture(scope="session")
+def shared_tmp(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """
+    初期化テストで共有する一時ディレクトリ
+
+    空のtemplatesディレクトリのみを作成します（non_existentは作成しない）。
+    """
+    base = tmp_path_factory.mktemp("proposal_generator")
+    (base / "templates").mkdir()
+    return base
+
+
+@pytest.fixture(scope="session")
+def baseline_proposal(proposal_generator: ProposalGenerator) -> str:
+    """
+    基準データから生成した提案書（セッションで1回だけレンダリング）
+
+    入力を変更しないテストはこの結果を共有します。
+    """
+    return proposal_generator.generate_proposal_draft(
+        rfp=BASE_RFP_DATA,
+        company=BASE_COMPANY_DATA,
+    )
+
+
 @pytest.mark.unit
 class TestProposalGeneratorInit:
     """ProposalGeneratorの初期化テストクラス"""
@@ -25,20 +87,16 @@ class TestProposalGeneratorInit:
         assert "format_budget" in generator.env.filters
         assert "format_date" in generator.env.filters
 
-    def test_初期化_正常系_カスタムテンプレートディレクトリ(self, tmp_path):
+    def test_初期化_正常系_カスタムテンプレートディレクトリ(self, shared_tmp):
         """カスタムテンプレートディレクトリで正常に初期化できることを確認"""
-        # 一時テンプレートディレクトリを作成
-        template_dir = tmp_path / "templates"
-        template_dir.mkdir()
-
-        generator = ProposalGenerator(template_dir=template_dir)
+        generator = ProposalGenerator(template_dir=shared_tmp / "templates")
 
         assert generator is not None
         assert generator.env is not None
 
-    def test_初期化_異常系_テンプレートディレクトリが存在しない(self, tmp_path):
+    def test_初期化_異常系_テンプレートディレクトリが存在しない(self, shared_tmp):
         """存在しないテンプレートディレクトリを指定した場合エラーが発生することを確認"""
-        non_existent_dir = tmp_path / "non_existent"
+        non_existent_dir = shared_tmp / "non_existent"
 
         with pytest.raises(FileNotFoundError, match="テンプレートディレクトリが見つかりません"):
             ProposalGenerator(template_dir=non_existent_dir)
@@ -48,88 +106,42 @@ class TestProposalGeneratorInit:
 class TestFormatBudget:
     """予算フォーマットフィルタのテストクラス"""
 
-    def test_format_budget_正常系_通常の予算(self):
-        """通常の予算が正しくフォーマットされることを確認"""
-        generator = ProposalGenerator()
-
-        result = generator._format_budget(10000000)
-
-        assert result == "10,000,000円"
-
-    def test_format_budget_正常系_小さい予算(self):
-        """小さい予算が正しくフォーマットされることを確認"""
-        generator = ProposalGenerator()
-
-        result = generator._format_budget(1000)
-
-        assert result == "1,000円"
-
-    def test_format_budget_正常系_ゼロ(self):
-        """ゼロが正しくフォーマットされることを確認"""
-        generator = ProposalGenerator()
-
-        result = generator._format_budget(0)
-
-        assert result == "0円"
-
-    def test_format_budget_正常系_None(self):
-        """Noneの場合は「未定」を返すことを確認"""
-        generator = ProposalGenerator()
-
-        result = generator._format_budget(None)
-
-        assert result == "未定"
+    @pytest.mark.parametrize(
+        "value, expected",
+        [
+            pytest.param(10000000, "10,000,000円", id="通常の予算"),
+            pytest.param(1000, "1,000円", id="小さい予算"),
+            pytest.param(0, "0円", id="ゼロ"),
+            pytest.param(None, "未定", id="None"),
+        ],
+    )
+    def test_format_budget_正常系(self, proposal_generator, value, expected):
+        """予算が桁区切り＋円でフォーマットされ、Noneは「未定」になることを確認"""
+        assert proposal_generator._format_budget(value) == expected
 
 
 @pytest.mark.unit
 class TestFormatDate:
     """日付フォーマットフィルタのテストクラス"""
 
-    def test_format_date_正常系_dateオブジェクト(self):
-        """dateオブジェクトが正しくフォーマットされることを確認"""
-        generator = ProposalGenerator()
-
-        result = generator._format_date(date(2025, 12, 31))
-
-        assert result == "2025年12月31日"
-
-    def test_format_date_正常系_datetimeオブジェクト(self):
-        """datetimeオブジェクトが正しくフォーマットされることを確認"""
-        generator = ProposalGenerator()
-
-        result = generator._format_date(datetime(2025, 12, 31, 15, 30, 0))
-
-        assert result == "2025年12月31日"
-
-    def test_format_date_正常系_ISO形式文字列(self):
-        """ISO形式文字列が正しくフォーマットされることを確認"""
-        generator = ProposalGenerator()
-
-        result = generator._format_date("2025-12-31")
-
-        assert result == "2025年12月31日"
-
-    def test_format_date_正常系_ISO形式文字列_時刻付き(self):
-        """ISO形式文字列（時刻付き）が正しくフォーマットされることを確認"""
-        generator = ProposalGenerator()
-
-        result = generator._format_date("2025-12-31T15:30:00")
-
-        assert result == "2025年12月31日"
-
-    def test_format_date_正常系_None(self):
-        """Noneの場合は「未定」を返すことを確認"""
-        generator = ProposalGenerator()
-
-        result = generator._format_date(None)
-
-        assert result == "未定"
-
-    def test_format_date_異常系_無効な文字列(self):
+    @pytest.mark.parametrize(
+        "value, expected",
+        [
+            pytest.param(date(2025, 12, 31), "2025年12月31日", id="dateオブジェクト"),
+            pytest.param(datetime(2025, 12, 31, 15, 30, 0), "2025年12月31日", id="datetimeオブジェクト"),
+            pytest.param(date(2025, 1, 5), "2025年1月5日", id="一桁の月日はゼロ埋めしない"),
+            pytest.param("2025-12-31", "2025年12月31日", id="ISO形式文字列"),
+            pytest.param("2025-12-31T15:30:00", "2025年12月31日", id="ISO形式文字列_時刻付き"),
+            pytest.param(None, "未定", id="None"),
+        ],
+    )
+    def test_format_date_正常系(self, proposal_generator, value, expected):
+        """日付が「YYYY年M月D日」形式でフォーマットされ、Noneは「未定」になることを確認"""
+        assert proposal_generator._format_date(value) == expected
+
+    def test_format_date_異常系_無効な文字列(self, proposal_generator):
         """無効な日付形式の文字列の場合、そのまま返すことを確認"""
-        generator = ProposalGenerator()
-
-        result = generator._format_date("invalid-date")
+        result = proposal_generator._format_date("invalid-date")
 
         assert result == "invalid-date"
 
@@ -138,42 +150,29 @@ class TestFormatDate:
 class TestGenerateProposalDraft:
     """提案書生成メソッドのテストクラス"""
 
+    @pytest.fixture(scope="module")
+    def base_rfp_data(self) -> types.MappingProxyType:
+        """入力を変更しないテスト用のRFPデータ（読み取り専用）"""
+        return BASE_RFP_DATA
+
+    @pytest.fixture(scope="module")
+    def base_company_data(self) -> types.MappingProxyType:
+        """入力を変更しないテスト用の会社データ（読み取り専用）"""
+        return BASE_COMPANY_DATA
+
     @pytest.fixture
     def mock_rfp_data(self) -> dict:
-        """テスト用のRFPデータ"""
-        return {
-            "id": "rfp-test-123",
-            "title": "テストRFP案件",
-            "issuing_org": "テスト組織",
-            "description": "これはテスト用のRFP案件です。詳細な説明がここに入ります。",
-            "budget": 10000000,
-            "region": "東京都",
-            "deadline": "2025-12-31",
-            "url": "https://example.com/rfp/123",
-            "external_doc_urls": ["https://example.com/doc1.pdf", "https://example.com/doc2.pdf"],
-        }
+        """テスト用のRFPデータ（テスト内で変更できるようコピーを返す）"""
+        return copy.deepcopy(dict(BASE_RFP_DATA))
 
     @pytest.fixture
     def mock_company_data(self) -> dict:
-        """テスト用の会社データ"""
-        return {
-            "id": "company-test-123",
-            "name": "テスト株式会社",
-            "description": "テスト用の会社です",
-            "skills": ["Python", "FastAPI", "React", "TypeScript", "PostgreSQL"],
-            "regions": ["東京都", "神奈川県"],
-        }
-
-    def test_generate_proposal_draft_正常系_基本情報のみ(
-        self, mock_rfp_data, mock_company_data
-    ):
-        """基本情報のみで提案書が正常に生成されることを確認"""
-        generator = ProposalGenerator()
+        """テスト用の会社データ（テスト内で変更できるようコピーを返す）"""
+        return copy.deepcopy(dict(BASE_COMPANY_DATA))
 
-        result = generator.generate_proposal_draft(
-            rfp=mock_rfp_data,
-            company=mock_company_data,
-        )
+    def test_generate_proposal_draft_正常系_基本情報のみ(self, baseline_proposal):
+        """基本情報のみで提案書が正常に生成されることを確認"""
+        result = baseline_proposal
 
         # 生成された提案書のチェック
         assert result is not None
@@ -181,25 +180,23 @@ class TestGenerateProposalDraft:
         assert len(result) > 0
 
         # RFP情報が含まれていることを確認
-        assert mock_rfp_data["title"] in result
-        assert mock_rfp_data["issuing_org"] in result
+        assert BASE_RFP_DATA["title"] in result
+        assert BASE_RFP_DATA["issuing_org"] in result
         assert "10,000,000円" in result  # 予算がフォーマットされている
         assert "2025年12月31日" in result  # 日付がフォーマットされている
 
         # 会社情報が含まれていることを確認
-        assert mock_company_data["name"] in result
-        assert mock_company_data["description"] in result
+        assert BASE_COMPANY_DATA["name"] in result
+        assert BASE_COMPANY_DATA["description"] in result
 
         # スキルが含まれていることを確認
-        for skill in mock_company_data["skills"]:
+        for skill in BASE_COMPANY_DATA["skills"]:
             assert skill in result
 
     def test_generate_proposal_draft_正常系_マッチング情報あり(
-        self, mock_rfp_data, mock_company_data
+        self, proposal_generator, base_rfp_data, base_company_data
     ):
         """マッチング情報ありで提案書が正常に生成されることを確認"""
-        generator = ProposalGenerator()
-
         match_score = 85
         summary_points = [
             "予算条件が適合しています",
@@ -207,9 +204,9 @@ class TestGenerateProposalDraft:
             "高いセマンティック類似度があります",
         ]
 
-        result = generator.generate_proposal_draft(
-            rfp=mock_rfp_data,
-            company=mock_company_data,
+        result = proposal_generator.generate_proposal_draft(
+            rfp=base_rfp_data,
+            company=base_company_data,
             match_score=match_score,
             summary_points=summary_points,
         )
@@ -220,13 +217,11 @@ class TestGenerateProposalDraft:
             assert point in result
 
     def test_generate_proposal_draft_正常系_予算がNone(
-        self, mock_rfp_data, mock_company_data
+        self, proposal_generator, mock_rfp_data, mock_company_data
     ):
         """予算がNoneの場合も正常に生成されることを確認"""
         mock_rfp_data["budget"] = None
-        generator = ProposalGenerator()
-
-        result = generator.generate_proposal_draft(
+        result = proposal_generator.generate_proposal_draft(
             rfp=mock_rfp_data,
             company=mock_company_data,
         )
@@ -235,13 +230,11 @@ class TestGenerateProposalDraft:
         assert "未定" in result
 
     def test_generate_proposal_draft_正常系_外部ドキュメントURLなし(
-        self, mock_rfp_data, mock_company_data
+        self, proposal_generator, mock_rfp_data, mock_company_data
     ):
         """外部ドキュメントURLがない場合も正常に生成されることを確認"""
         mock_rfp_data["external_doc_urls"] = []
-        generator = ProposalGenerator()
-
-        result = generator.generate_proposal_draft(
+        result = proposal_generator.generate_proposal_draft(
             rfp=mock_rfp_data,
             company=mock_company_data,
         )
@@ -250,41 +243,67 @@ class TestGenerateProposalDraft:
         assert "外部資料なし" in result
 
     def test_generate_proposal_draft_異常系_RFP必須フィールド不足(
-        self, mock_rfp_data, mock_company_data
+        self, monkeypatch, proposal_generator, mock_rfp_data, mock_company_data
     ):
         """RFPの必須フィールドが不足している場合エラーが発生することを確認"""
         # titleフィールドを削除
         del mock_rfp_data["title"]
-        generator = ProposalGenerator()
+        # 検証より先にテンプレートを読み込まないことを確認するため差し替える
+        get_template = MagicMock()
+        monkeypatch.setattr(proposal_generator.env, "get_template", get_template)
 
         with pytest.raises(ValueError, match="RFPに必須フィールドがありません: title"):
-            generator.generate_proposal_draft(
+            proposal_generator.generate_proposal_draft(
                 rfp=mock_rfp_data,
                 company=mock_company_data,
             )
 
+        get_template.assert_not_called()
+
     def test_generate_proposal_draft_異常系_会社必須フィールド不足(
-        self, mock_rfp_data, mock_company_data
+        self, monkeypatch, proposal_generator, mock_rfp_data, mock_company_data
     ):
         """会社情報の必須フィールドが不足している場合エラーが発生することを確認"""
         # skillsフィールドを削除
         del mock_company_data["skills"]
-        generator = ProposalGenerator()
+        # 検証より先にテンプレートを読み込まないことを確認するため差し替える
+        get_template = MagicMock()
+        monkeypatch.setattr(proposal_generator.env, "get_template", get_template)
 
         with pytest.raises(ValueError, match="会社情報に必須フィールドがありません: skills"):
-            generator.generate_proposal_draft(
+            proposal_generator.generate_proposal_draft(
+                rfp=mock_rfp_data,
+                company=mock_company_data,
+            )
+
+        get_template.assert_not_called()
+
+    def test_generate_proposal_draft_異常系_RFP必須フィールドが複数不足(
+        self, monkeypatch, proposal_generator, mock_rfp_data, mock_company_data
+    ):
+        """RFPの必須フィールドが複数不足している場合、すべてエラーに含まれることを確認"""
+        del mock_rfp_data["title"]
+        del mock_rfp_data["deadline"]
+        # 検証より先にテンプレートを読み込まないことを確認するため差し替える
+        get_template = MagicMock()
+        monkeypatch.setattr(proposal_generator.env, "get_template", get_template)
+
+        with pytest.raises(
+            ValueError, match="RFPに必須フィールドがありません: deadline, title"
+        ):
+            proposal_generator.generate_proposal_draft(
                 rfp=mock_rfp_data,
                 company=mock_company_data,
             )
 
+        get_template.assert_not_called()
+
     def test_generate_proposal_draft_正常系_会社descriptionがNone(
-        self, mock_rfp_data, mock_company_data
+        self, proposal_generator, mock_rfp_data, mock_company_data
     ):
         """会社のdescriptionがNoneでも正常に生成されることを確認"""
         mock_company_data["description"] = None
-        generator = ProposalGenerator()
-
-        result = generator.generate_proposal_draft(
+        result = proposal_generator.generate_proposal_draft(
             rfp=mock_rfp_data,
             company=mock_company_data,
         )
@@ -292,13 +311,11 @@ class TestGenerateProposalDraft:
         assert result is not None
 
     def test_generate_proposal_draft_正常系_URLがNone(
-        self, mock_rfp_data, mock_company_data
+        self, proposal_generator, mock_rfp_data, mock_company_data
     ):
         """RFPのURLがNoneでも正常に生成されることを確認"""
         mock_rfp_data["url"] = None
-        generator = ProposalGenerator()
-
-        result = generator.generate_proposal_draft(
+        result = proposal_generator.generate_proposal_draft(
             rfp=mock_rfp_data,
             company=mock_company_data,
         )
@@ -306,14 +323,12 @@ class TestGenerateProposalDraft:
         assert result is not None
 
     def test_generate_proposal_draft_正常系_summary_pointsが空リスト(
-        self, mock_rfp_data, mock_company_data
+        self, proposal_generator, base_rfp_data, base_company_data
     ):
         """summary_pointsが空リストでも正常に生成されることを確認"""
-        generator = ProposalGenerator()
-
-        result = generator.generate_proposal_draft(
-            rfp=mock_rfp_data,
-            company=mock_company_data,
+        result = proposal_generator.generate_proposal_draft(
+            rfp=base_rfp_data,
+            company=base_company_data,
             match_score=85,
             summary_points=[],
         )
@@ -322,13 +337,11 @@ class TestGenerateProposalDraft:
         assert "85点" in result
 
     def test_generate_proposal_draft_正常系_地域が複数(
-        self, mock_rfp_data, mock_company_data
+        self, proposal_generator, mock_rfp_data, mock_company_data
     ):
         """会社が複数の地域に対応している場合も正常に生成されることを確認"""
         mock_company_data["regions"] = ["東京都", "神奈川県", "千葉県", "埼玉県"]
-        generator = ProposalGenerator()
-
-        result = generator.generate_proposal_draft(
+        result = proposal_generator.generate_proposal_draft(
             rfp=mock_rfp_data,
             company=mock_company_data,
         )
@@ -337,3 +350,20 @@ class TestGenerateProposalDraft:
         # 地域が含まれていることを確認
         for region in mock_company_data["regions"]:
             assert region in result
+
+    def test_generate_proposal_draft_異常系_必須フィールド不足はテンプレート読み込み前にエラー(
+        self, monkeypatch, proposal_generator, mock_rfp_data, mock_company_data
+    ):
+        """必須フィールド不足はテンプレートを読み込む前にエラーとなることを確認"""
+        del mock_rfp_data["title"]
+        # 検証より先にテンプレートを読み込まないことを確認するため差し替える
+        get_template = MagicMock()
+        monkeypatch.setattr(proposal_generator.env, "get_template", get_template)
+
+        with pytest.raises(ValueError, match="RFPに必須フィールドがありません: title"):
+            proposal_generator.generate_proposal_draft(
+                rfp=mock_rfp_data,
+                company=mock_company_data,
+            )
+
+        get_template.assert_not_called()
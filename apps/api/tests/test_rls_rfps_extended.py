@@ -23,21 +23,40 @@ tender_deadline, opening_event_date, item_code, lg_code, city_code, certificatio
     - SUPABASE_SERVICE_KEY: Supabaseサービスキー
 """
 import pytest
+from postgrest.exceptions import APIError
 from supabase import Client
 from typing import Dict, Any
 from datetime import datetime, timedelta
 import logging
 
 from tests.fixtures.rls_fixtures import (
+    RLS_VIOLATION_CODE,
     RlsTestUser,
     supabase_service_client,
     authenticated_client_1,
     test_user_1,
     rfp_data,
+    rfp_external_id_prefix,
 )
 
 logger = logging.getLogger(__name__)
 
+# rfpsテーブルに追加された拡張フィールド
+_EXTENDED_FIELDS = (
+    "category",
+    "procedure_type",
+    "cft_issue_date",
+    "tender_deadline",
+    "opening_event_date",
+    "item_code",
+    "lg_code",
+    "city_code",
+    "certification",
+)
+
+# 拡張フィールドを検証する参照で取得する列（embeddingは1536次元で大きいため取得しない）
+_EXTENDED_SELECT = "id,title," + ",".join(_EXTENDED_FIELDS)
+
 
 def check_extended_fields_available(client: Client) -> bool:
     """
@@ -74,6 +93,7 @@ class TestRfpsExtendedFieldsRLS:
         authenticated_client_1: Client,
         supabase_service_client: Client,
         test_user_1: RlsTestUser,
+        rfp_external_id_prefix: str,
     ) -> None:
         """
         認証ユーザーが拡張フィールド付きRFPを参照できることを確認する
@@ -86,61 +106,55 @@ class TestRfpsExtendedFieldsRLS:
             2. 認証ユーザーで同じRFPを参照
             3. すべての拡張フィールドが正しく取得できることを確認
         """
-        import uuid
-
-        try:
-            # RFPを作成（拡張フィールド付き）
-            rfp = {
-                "external_id": f"test-extended-{uuid.uuid4()}",
-                "title": "拡張フィールドテスト案件",
-                "issuing_org": "テスト省庁",
-                "description": "KKJ API拡張フィールドのテスト案件です。",
-                "budget": 5000000,
-                "region": "東京都",
-                "deadline": (datetime.now() + timedelta(days=30)).strftime("%Y-%m-%d"),
-                "embedding": [0.1] * 1536,
-                # 拡張フィールド
-                "category": "建設工事",
-                "procedure_type": "一般競争入札",
-                "cft_issue_date": datetime.now().isoformat(),
-                "tender_deadline": (datetime.now() + timedelta(days=30)).isoformat(),
-                "opening_event_date": (datetime.now() + timedelta(days=31)).isoformat(),
-                "item_code": "30100100",
-                "lg_code": "13",  # 東京都
-                "city_code": "100",
-                "certification": "建設業許可を要する",
-            }
-
-            response = supabase_service_client.table("rfps").insert(rfp).execute()
-            assert response.data is not None
-            assert len(response.data) == 1
-            rfp_id = response.data[0]["id"]
-
-            # 認証ユーザーでRFPを参照
-            auth_response = authenticated_client_1.table("rfps").select("*").eq("id", rfp_id).execute()
-
-            assert auth_response.data is not None
-            assert len(auth_response.data) == 1
-            fetched_rfp = auth_response.data[0]
-
-            # 基本フィールド確認
-            assert fetched_rfp["id"] == rfp_id
-            assert fetched_rfp["title"] == "拡張フィールドテスト案件"
-
-            # 拡張フィールド確認
-            assert fetched_rfp["category"] == "建設工事"
-            assert fetched_rfp["procedure_type"] == "一般競争入札"
-            assert fetched_rfp["item_code"] == "30100100"
-            assert fetched_rfp["lg_code"] == "13"
-            assert fetched_rfp["city_code"] == "100"
-            assert fetched_rfp["certification"] == "建設業許可を要する"
-            assert fetched_rfp["cft_issue_date"] is not None
-            assert fetched_rfp["tender_deadline"] is not None
-            assert fetched_rfp["opening_event_date"] is not None
-
-        finally:
-            # クリーンアップ
-            supabase_service_client.table("rfps").delete().eq("external_id", f"test-extended-{rfp_id}").execute()
+        now = datetime.now()
+
+        # RFPを作成（拡張フィールド付き）
+        rfp = {
+            "external_id": f"{rfp_external_id_prefix}extended",
+            "title": "拡張フィールドテスト案件",
+            "issuing_org": "テスト省庁",
+            "description": "KKJ API拡張フィールドのテスト案件です。",
+            "budget": 5000000,
+            "region": "東京都",
+            "deadline": (now + timedelta(days=30)).strftime("%Y-%m-%d"),
+            # 拡張フィールド
+            "category": "建設工事",
+            "procedure_type": "一般競争入札",
+            "cft_issue_date": now.isoformat(),
+            "tender_deadline": (now + timedelta(days=30)).isoformat(),
+            "opening_event_date": (now + timedelta(days=31)).isoformat(),
+            "item_code": "30100100",
+            "lg_code": "13",  # 東京都
+            "city_code": "100",
+            "certification": "建設業許可を要する",
+        }
+
+        response = supabase_service_client.table("rfps").insert(rfp).execute()
+        assert response.data is not None
+        assert len(response.data) == 1
+        rfp_id = response.data[0]["id"]
+
+        # 認証ユーザーでRFPを参照
+        auth_response = authenticated_client_1.table("rfps").select(_EXTENDED_SELECT).eq("id", rfp_id).execute()
+
+        assert auth_response.data is not None
+        assert len(auth_response.data) == 1
+        fetched_rfp = auth_response.data[0]
+
+        # 基本フィールド確認
+        assert fetched_rfp["id"] == rfp_id
+        assert fetched_rfp["title"] == "拡張フィールドテスト案件"
+
+        # 拡張フィールド確認
+        assert fetched_rfp["category"] == "建設工事"
+        assert fetched_rfp["procedure_type"] == "一般競争入札"
+        assert fetched_rfp["item_code"] == "30100100"
+        assert fetched_rfp["lg_code"] == "13"
+        assert fetched_rfp["city_code"] == "100"
+        assert fetched_rfp["certification"] == "建設業許可を要する"
+        assert fetched_rfp["cft_issue_date"] is not None
+        assert fetched_rfp["tender_deadline"] is not None
+        assert fetched_rfp["opening_event_date"] is not None
 
     # ========================================================================
     # テスト2: 拡張フィールドでのフィルタリングが機能する
@@ -150,6 +164,7 @@ class TestRfpsExtendedFieldsRLS:
         self,
         authenticated_client_1: Client,
         supabase_service_client: Client,
+        rfp_external_id_prefix: str,
     ) -> None:
         """
         拡張フィールド（category, lg_code）でフィルタリングできることを確認する
@@ -162,85 +177,67 @@ class TestRfpsExtendedFieldsRLS:
             2. 認証ユーザーで特定のcategoryでフィルタリング
             3. 正しいRFPのみが取得できることを確認
         """
-        import uuid
-
-        rfp_ids = []
-        try:
-            # RFP 1: カテゴリ「建設工事」
-            rfp_1 = {
-                "external_id": f"test-filter-1-{uuid.uuid4()}",
-                "title": "建設工事案件",
-                "issuing_org": "省庁A",
-                "description": "建設工事の案件",
-                "budget": 10000000,
-                "region": "東京都",
-                "deadline": (datetime.now() + timedelta(days=30)).strftime("%Y-%m-%d"),
-                "embedding": [0.1] * 1536,
-                "category": "建設工事",
-                "lg_code": "13",
-            }
-
-            # RFP 2: カテゴリ「製造・供給」
-            rfp_2 = {
-                "external_id": f"test-filter-2-{uuid.uuid4()}",
-                "title": "製造・供給案件",
-                "issuing_org": "省庁B",
-                "description": "製造・供給の案件",
-                "budget": 5000000,
-                "region": "大阪府",
-                "deadline": (datetime.now() + timedelta(days=30)).strftime("%Y-%m-%d"),
-                "embedding": [0.2] * 1536,
-                "category": "製造・供給",
-                "lg_code": "27",
-            }
-
-            # RFPを作成
-            response_1 = supabase_service_client.table("rfps").insert(rfp_1).execute()
-            response_2 = supabase_service_client.table("rfps").insert(rfp_2).execute()
-
-            assert response_1.data and len(response_1.data) == 1
-            assert response_2.data and len(response_2.data) == 1
-
-            rfp_id_1 = response_1.data[0]["id"]
-            rfp_id_2 = response_2.data[0]["id"]
-            rfp_ids = [rfp_id_1, rfp_id_2]
-
-            # categoryでフィルタリング: 建設工事
-            filter_response = (
-                authenticated_client_1.table("rfps")
-                .select("*")
-                .eq("category", "建設工事")
-                .execute()
-            )
-
-            assert filter_response.data is not None
-            # 作成したRFPは少なくとも含まれるはず
-            filtered_titles = [r["title"] for r in filter_response.data]
-            assert "建設工事案件" in filtered_titles
-
-            # 製造・供給案件は含まれないはず
-            assert "製造・供給案件" not in filtered_titles
-
-            # lg_codeでフィルタリング: 大阪府（27）
-            lg_filter_response = (
-                authenticated_client_1.table("rfps")
-                .select("*")
-                .eq("lg_code", "27")
-                .execute()
-            )
-
-            assert lg_filter_response.data is not None
-            # 製造・供給案件は含まれるはず
-            lg_titles = [r["title"] for r in lg_filter_response.data]
-            assert "製造・供給案件" in lg_titles
-
-        finally:
-            # クリーンアップ
-            for rfp_id in rfp_ids:
-                try:
-                    supabase_service_client.table("rfps").delete().eq("id", rfp_id).execute()
-                except Exception:
-                    pass
+        now = datetime.now()
+
+        # RFP 1: カテゴリ「建設工事」
+        rfp_1 = {
+            "external_id": f"{rfp_external_id_prefix}filter-1",
+            "title": "建設工事案件",
+            "issuing_org": "省庁A",
+            "description": "建設工事の案件",
+            "budget": 10000000,
+            "region": "東京都",
+            "deadline": (now + timedelta(days=30)).strftime("%Y-%m-%d"),
+            "category": "建設工事",
+            "lg_code": "13",
+        }
+
+        # RFP 2: カテゴリ「製造・供給」
+        rfp_2 = {
+            "external_id": f"{rfp_external_id_prefix}filter-2",
+            "title": "製造・供給案件",
+            "issuing_org": "省庁B",
+            "description": "製造・供給の案件",
+            "budget": 5000000,
+            "region": "大阪府",
+            "deadline": (now + timedelta(days=30)).strftime("%Y-%m-%d"),
+            "category": "製造・供給",
+            "lg_code": "27",
+        }
+
+        # RFPを作成（複数行を1回のリクエストで作成）
+        batch = supabase_service_client.table("rfps").insert([rfp_1, rfp_2]).execute()
+
+        assert batch.data and len(batch.data) == 2
+
+        # categoryでフィルタリング: 建設工事
+        filter_response = (
+            authenticated_client_1.table("rfps")
+            .select("id,title")
+            .eq("category", "建設工事")
+            .execute()
+        )
+
+        assert filter_response.data is not None
+        # 作成したRFPは少なくとも含まれるはず
+        filtered_titles = {r["title"] for r in filter_response.data}
+        assert "建設工事案件" in filtered_titles
+
+        # 製造・供給案件は含まれないはず
+        assert "製造・供給案件" not in filtered_titles
+
+        # lg_codeでフィルタリング: 大阪府（27）
+        lg_filter_response = (
+            authenticated_client_1.table("rfps")
+            .select("id,title")
+            .eq("lg_code", "27")
+            .execute()
+        )
+
+        assert lg_filter_response.data is not None
+        # 製造・供給案件は含まれるはず
+        lg_titles = {r["title"] for r in lg_filter_response.data}
+        assert "製造・供給案件" in lg_titles
 
     # ========================================================================
     # テスト3: 日時フィールドの範囲検索が機能する
@@ -250,6 +247,7 @@ class TestRfpsExtendedFieldsRLS:
         self,
         authenticated_client_1: Client,
         supabase_service_client: Client,
+        rfp_external_id_prefix: str,
     ) -> None:
         """
         日時フィールド（tender_deadline）の範囲検索が機能することを確認する
@@ -262,91 +260,73 @@ class TestRfpsExtendedFieldsRLS:
             2. 認証ユーザーで期限範囲を指定してフィルタリング
             3. 正しい範囲のRFPのみが取得できることを確認
         """
-        import uuid
-
-        rfp_ids = []
-        try:
-            now = datetime.now()
-            date_1 = now + timedelta(days=10)
-            date_2 = now + timedelta(days=20)
-            date_3 = now + timedelta(days=30)
-
-            # RFP 1: 10日後が期限
-            rfp_1 = {
-                "external_id": f"test-date-1-{uuid.uuid4()}",
-                "title": "期限10日後",
-                "issuing_org": "省庁A",
-                "description": "早い期限",
-                "budget": 1000000,
-                "region": "東京都",
-                "deadline": (now + timedelta(days=10)).strftime("%Y-%m-%d"),
-                "embedding": [0.1] * 1536,
-                "tender_deadline": date_1.isoformat(),
-            }
-
-            # RFP 2: 20日後が期限
-            rfp_2 = {
-                "external_id": f"test-date-2-{uuid.uuid4()}",
-                "title": "期限20日後",
-                "issuing_org": "省庁B",
-                "description": "中間期限",
-                "budget": 2000000,
-                "region": "大阪府",
-                "deadline": (now + timedelta(days=20)).strftime("%Y-%m-%d"),
-                "embedding": [0.2] * 1536,
-                "tender_deadline": date_2.isoformat(),
-            }
-
-            # RFP 3: 30日後が期限
-            rfp_3 = {
-                "external_id": f"test-date-3-{uuid.uuid4()}",
-                "title": "期限30日後",
-                "issuing_org": "省庁C",
-                "description": "遠い期限",
-                "budget": 3000000,
-                "region": "福岡県",
-                "deadline": (now + timedelta(days=30)).strftime("%Y-%m-%d"),
-                "embedding": [0.3] * 1536,
-                "tender_deadline": date_3.isoformat(),
-            }
-
-            # RFPを作成
-            response_1 = supabase_service_client.table("rfps").insert(rfp_1).execute()
-            response_2 = supabase_service_client.table("rfps").insert(rfp_2).execute()
-            response_3 = supabase_service_client.table("rfps").insert(rfp_3).execute()
-
-            assert all([response_1.data, response_2.data, response_3.data])
-            rfp_ids = [r["id"] for r in [response_1.data[0], response_2.data[0], response_3.data[0]]]
-
-            # 範囲検索: 15日後〜25日後
-            query_date_start = (now + timedelta(days=15)).isoformat()
-            query_date_end = (now + timedelta(days=25)).isoformat()
-
-            range_response = (
-                authenticated_client_1.table("rfps")
-                .select("*")
-                .gte("tender_deadline", query_date_start)
-                .lte("tender_deadline", query_date_end)
-                .execute()
-            )
-
-            assert range_response.data is not None
-            range_titles = [r["title"] for r in range_response.data]
-
-            # 期限20日後は含まれるはず
-            assert "期限20日後" in range_titles
-
-            # 期限10日後と30日後は含まれないはず
-            assert "期限10日後" not in range_titles
-            assert "期限30日後" not in range_titles
-
-        finally:
-            # クリーンアップ
-            for rfp_id in rfp_ids:
-                try:
-                    supabase_service_client.table("rfps").delete().eq("id", rfp_id).execute()
-                except Exception:
-                    pass
+        now = datetime.now()
+        date_1 = now + timedelta(days=10)
+        date_2 = now + timedelta(days=20)
+        date_3 = now + timedelta(days=30)
+
+        # RFP 1: 10日後が期限
+        rfp_1 = {
+            "external_id": f"{rfp_external_id_prefix}date-1",
+            "title": "期限10日後",
+            "issuing_org": "省庁A",
+            "description": "早い期限",
+            "budget": 1000000,
+            "region": "東京都",
+            "deadline": (now + timedelta(days=10)).strftime("%Y-%m-%d"),
+            "tender_deadline": date_1.isoformat(),
+        }
+
+        # RFP 2: 20日後が期限
+        rfp_2 = {
+            "external_id": f"{rfp_external_id_prefix}date-2",
+            "title": "期限20日後",
+            "issuing_org": "省庁B",
+            "description": "中間期限",
+            "budget": 2000000,
+            "region": "大阪府",
+            "deadline": (now + timedelta(days=20)).strftime("%Y-%m-%d"),
+            "tender_deadline": date_2.isoformat(),
+        }
+
+        # RFP 3: 30日後が期限
+        rfp_3 = {
+            "external_id": f"{rfp_external_id_prefix}date-3",
+            "title": "期限30日後",
+            "issuing_org": "省庁C",
+            "description": "遠い期限",
+            "budget": 3000000,
+            "region": "福岡県",
+            "deadline": (now + timedelta(days=30)).strftime("%Y-%m-%d"),
+            "tender_deadline": date_3.isoformat(),
+        }
+
+        # RFPを作成（複数行を1回のリクエストで作成）
+        batch = supabase_service_client.table("rfps").insert([rfp_1, rfp_2, rfp_3]).execute()
+
+        assert batch.data and len(batch.data) == 3
+
+        # 範囲検索: 15日後〜25日後
+        query_date_start = (now + timedelta(days=15)).isoformat()
+        query_date_end = (now + timedelta(days=25)).isoformat()
+
+        range_response = (
+            authenticated_client_1.table("rfps")
+            .select("id,title")
+            .gte("tender_deadline", query_date_start)
+            .lte("tender_deadline", query_date_end)
+            .execute()
+        )
+
+        assert range_response.data is not None
+        range_titles = {r["title"] for r in range_response.data}
+
+        # 期限20日後は含まれるはず
+        assert "期限20日後" in range_titles
+
+        # 期限10日後と30日後は含まれないはず
+        assert "期限10日後" not in range_titles
+        assert "期限30日後" not in range_titles
 
     # ========================================================================
     # テスト4: NULLフィールドの扱いが正常
@@ -356,6 +336,7 @@ class TestRfpsExtendedFieldsRLS:
         self,
         authenticated_client_1: Client,
         supabase_service_client: Client,
+        rfp_external_id_prefix: str,
     ) -> None:
         """
         拡張フィールドがNULLのRFPが正しく処理されることを確認する
@@ -368,61 +349,50 @@ class TestRfpsExtendedFieldsRLS:
             2. 認証ユーザーで取得
             3. NULLフィールドがNoneとして返されることを確認
         """
-        import uuid
-
-        rfp_id = None
-        try:
-            # 拡張フィールドのいくつかをNULLで作成
-            rfp = {
-                "external_id": f"test-null-{uuid.uuid4()}",
-                "title": "NULLフィールドテスト",
-                "issuing_org": "省庁",
-                "description": "一部のフィールドがNULLです",
-                "budget": 5000000,
-                "region": "東京都",
-                "deadline": (datetime.now() + timedelta(days=30)).strftime("%Y-%m-%d"),
-                "embedding": [0.1] * 1536,
-                # 拡張フィールド: 一部のみ設定
-                "category": "建設工事",
-                "procedure_type": None,  # NULLで作成
-                "cft_issue_date": datetime.now().isoformat(),
-                "tender_deadline": None,  # NULLで作成
-                "opening_event_date": None,  # NULLで作成
-                "item_code": None,  # NULLで作成
-                "lg_code": "13",
-                "city_code": None,  # NULLで作成
-                "certification": None,  # NULLで作成
-            }
-
-            response = supabase_service_client.table("rfps").insert(rfp).execute()
-            assert response.data and len(response.data) == 1
-            rfp_id = response.data[0]["id"]
-
-            # 認証ユーザーで取得
-            auth_response = authenticated_client_1.table("rfps").select("*").eq("id", rfp_id).execute()
-
-            assert auth_response.data is not None
-            assert len(auth_response.data) == 1
-            fetched_rfp = auth_response.data[0]
-
-            # NULLフィールドがNoneとして返されることを確認
-            assert fetched_rfp["category"] == "建設工事"
-            assert fetched_rfp["procedure_type"] is None
-            assert fetched_rfp["cft_issue_date"] is not None
-            assert fetched_rfp["tender_deadline"] is None
-            assert fetched_rfp["opening_event_date"] is None
-            assert fetched_rfp["item_code"] is None
-            assert fetched_rfp["lg_code"] == "13"
-            assert fetched_rfp["city_code"] is None
-            assert fetched_rfp["certification"] is None
-
-        finally:
-            # クリーンアップ
-            if rfp_id:
-                try:
-                    supabase_service_client.table("rfps").delete().eq("id", rfp_id).execute()
-                except Exception:
-                    pass
+        now = datetime.now()
+
+        # 拡張フィールドのいくつかをNULLで作成
+        rfp = {
+            "external_id": f"{rfp_external_id_prefix}null",
+            "title": "NULLフィールドテスト",
+            "issuing_org": "省庁",
+            "description": "一部のフィールドがNULLです",
+            "budget": 5000000,
+            "region": "東京都",
+            "deadline": (now + timedelta(days=30)).strftime("%Y-%m-%d"),
+            # 拡張フィールド: 一部のみ設定
+            "category": "建設工事",
+            "procedure_type": None,  # NULLで作成
+            "cft_issue_date": now.isoformat(),
+            "tender_deadline": None,  # NULLで作成
+            "opening_event_date": None,  # NULLで作成
+            "item_code": None,  # NULLで作成
+            "lg_code": "13",
+            "city_code": None,  # NULLで作成
+            "certification": None,  # NULLで作成
+        }
+
+        response = supabase_service_client.table("rfps").insert(rfp).execute()
+        assert response.data and len(response.data) == 1
+        rfp_id = response.data[0]["id"]
+
+        # 認証ユーザーで取得
+        auth_response = authenticated_client_1.table("rfps").select(_EXTENDED_SELECT).eq("id", rfp_id).execute()
+
+        assert auth_response.data is not None
+        assert len(auth_response.data) == 1
+        fetched_rfp = auth_response.data[0]
+
+        # NULLフィールドがNoneとして返されることを確認
+        assert fetched_rfp["category"] == "建設工事"
+        assert fetched_rfp["procedure_type"] is None
+        assert fetched_rfp["cft_issue_date"] is not None
+        assert fetched_rfp["tender_deadline"] is None
+        assert fetched_rfp["opening_event_date"] is None
+        assert fetched_rfp["item_code"] is None
+        assert fetched_rfp["lg_code"] == "13"
+        assert fetched_rfp["city_code"] is None
+        assert fetched_rfp["certification"] is None
 
     # ========================================================================
     # テスト5: Service Roleのみが拡張フィールド付きRFPを作成できる
@@ -432,6 +402,7 @@ class TestRfpsExtendedFieldsRLS:
         self,
         authenticated_client_1: Client,
         supabase_service_client: Client,
+        rfp_external_id_prefix: str,
     ) -> None:
         """
         一般ユーザーはRFPを作成できず、Service Roleのみが作成できることを確認する
@@ -442,56 +413,44 @@ class TestRfpsExtendedFieldsRLS:
             1. 認証ユーザーでRFP作成を試行 → エラー確認
             2. Service RoleでRFP作成 → 成功確認
         """
-        import uuid
-
-        rfp_id = None
-        try:
-            # 一般ユーザーでRFP作成を試行（拡張フィールド付き）
-            new_rfp = {
-                "external_id": f"unauthorized-{uuid.uuid4()}",
-                "title": "不正なRFP",
-                "issuing_org": "不正な組織",
-                "description": "一般ユーザーが作成しようとしたRFP",
-                "budget": 5000000,
-                "region": "東京都",
-                "deadline": (datetime.now() + timedelta(days=30)).strftime("%Y-%m-%d"),
-                "embedding": [0.1] * 1536,
-                "category": "建設工事",  # 拡張フィールド
-                "lg_code": "13",  # 拡張フィールド
-            }
-
-            # RLSポリシーにより作成が拒否される
-            with pytest.raises(Exception):
-                authenticated_client_1.table("rfps").insert(new_rfp).execute()
-
-            # Service Roleでは作成できる
-            service_rfp = {
-                "external_id": f"authorized-{uuid.uuid4()}",
-                "title": "Service Roleで作成したRFP",
-                "issuing_org": "省庁",
-                "description": "Service Roleで正しく作成されたRFP",
-                "budget": 5000000,
-                "region": "東京都",
-                "deadline": (datetime.now() + timedelta(days=30)).strftime("%Y-%m-%d"),
-                "embedding": [0.1] * 1536,
-                "category": "建設工事",
-                "lg_code": "13",
-            }
-
-            response = supabase_service_client.table("rfps").insert(service_rfp).execute()
-            assert response.data is not None
-            assert len(response.data) == 1
-            assert response.data[0]["category"] == "建設工事"
-            assert response.data[0]["lg_code"] == "13"
-            rfp_id = response.data[0]["id"]
-
-        finally:
-            # クリーンアップ
-            if rfp_id:
-                try:
-                    supabase_service_client.table("rfps").delete().eq("id", rfp_id).execute()
-                except Exception:
-                    pass
+        now = datetime.now()
+
+        # 一般ユーザーでRFP作成を試行（拡張フィールド付き）
+        new_rfp = {
+            "external_id": f"{rfp_external_id_prefix}unauthorized",
+            "title": "不正なRFP",
+            "issuing_org": "不正な組織",
+            "description": "一般ユーザーが作成しようとしたRFP",
+            "budget": 5000000,
+            "region": "東京都",
+            "deadline": (now + timedelta(days=30)).strftime("%Y-%m-%d"),
+            "category": "建設工事",  # 拡張フィールド
+            "lg_code": "13",  # 拡張フィールド
+        }
+
+        # RLSポリシーにより作成が拒否される
+        with pytest.raises(APIError) as exc_info:
+            authenticated_client_1.table("rfps").insert(new_rfp).execute()
+        assert exc_info.value.code == RLS_VIOLATION_CODE
+
+        # Service Roleでは作成できる
+        service_rfp = {
+            "external_id": f"{rfp_external_id_prefix}authorized",
+            "title": "Service Roleで作成したRFP",
+            "issuing_org": "省庁",
+            "description": "Service Roleで正しく作成されたRFP",
+            "budget": 5000000,
+            "region": "東京都",
+            "deadline": (now + timedelta(days=30)).strftime("%Y-%m-%d"),
+            "category": "建設工事",
+            "lg_code": "13",
+        }
+
+        response = supabase_service_client.table("rfps").insert(service_rfp).execute()
+        assert response.data is not None
+        assert len(response.data) == 1
+        assert response.data[0]["category"] == "建設工事"
+        assert response.data[0]["lg_code"] == "13"
 
     # ========================================================================
     # テスト6: 複合フィルタリング（複数の拡張フィールド）
@@ -501,6 +460,7 @@ class TestRfpsExtendedFieldsRLS:
         self,
         authenticated_client_1: Client,
         supabase_service_client: Client,
+        rfp_external_id_prefix: str,
     ) -> None:
         """
         複数の拡張フィールドを組み合わせてフィルタリングできることを確認する
@@ -513,86 +473,70 @@ class TestRfpsExtendedFieldsRLS:
             2. 認証ユーザーで複合フィルタリング実行
             3. 正しい結果が取得できることを確認
         """
-        import uuid
-
-        rfp_ids = []
-        try:
-            # RFP 1: 建設工事 × 東京都
-            rfp_1 = {
-                "external_id": f"test-combined-1-{uuid.uuid4()}",
-                "title": "東京建設工事",
-                "issuing_org": "省庁A",
-                "description": "東京の建設工事案件",
-                "budget": 10000000,
-                "region": "東京都",
-                "deadline": (datetime.now() + timedelta(days=30)).strftime("%Y-%m-%d"),
-                "embedding": [0.1] * 1536,
-                "category": "建設工事",
-                "lg_code": "13",
-            }
-
-            # RFP 2: 建設工事 × 大阪府
-            rfp_2 = {
-                "external_id": f"test-combined-2-{uuid.uuid4()}",
-                "title": "大阪建設工事",
-                "issuing_org": "省庁B",
-                "description": "大阪の建設工事案件",
-                "budget": 10000000,
-                "region": "大阪府",
-                "deadline": (datetime.now() + timedelta(days=30)).strftime("%Y-%m-%d"),
-                "embedding": [0.2] * 1536,
-                "category": "建設工事",
-                "lg_code": "27",
-            }
-
-            # RFP 3: 製造・供給 × 東京都
-            rfp_3 = {
-                "external_id": f"test-combined-3-{uuid.uuid4()}",
-                "title": "東京製造・供給",
-                "issuing_org": "省庁C",
-                "description": "東京の製造・供給案件",
-                "budget": 5000000,
-                "region": "東京都",
-                "deadline": (datetime.now() + timedelta(days=30)).strftime("%Y-%m-%d"),
-                "embedding": [0.3] * 1536,
-                "category": "製造・供給",
-                "lg_code": "13",
-            }
-
-            # RFPを作成
-            response_1 = supabase_service_client.table("rfps").insert(rfp_1).execute()
-            response_2 = supabase_service_client.table("rfps").insert(rfp_2).execute()
-            response_3 = supabase_service_client.table("rfps").insert(rfp_3).execute()
-
-            assert all([response_1.data, response_2.data, response_3.data])
-            rfp_ids = [r["id"] for r in [response_1.data[0], response_2.data[0], response_3.data[0]]]
-
-            # 複合フィルタリング: 建設工事 AND 東京都
-            combined_response = (
-                authenticated_client_1.table("rfps")
-                .select("*")
-                .eq("category", "建設工事")
-                .eq("lg_code", "13")
-                .execute()
-            )
-
-            assert combined_response.data is not None
-            combined_titles = [r["title"] for r in combined_response.data]
-
-            # 東京建設工事は含まれるはず
-            assert "東京建設工事" in combined_titles
-
-            # 大阪建設工事と東京製造・供給は含まれないはず
-            assert "大阪建設工事" not in combined_titles
-            assert "東京製造・供給" not in combined_titles
-
-        finally:
-            # クリーンアップ
-            for rfp_id in rfp_ids:
-                try:
-                    supabase_service_client.table("rfps").delete().eq("id", rfp_id).execute()
-                except Exception:
-                    pass
+        now = datetime.now()
+
+        # RFP 1: 建設工事 × 東京都
+        rfp_1 = {
+            "external_id": f"{rfp_external_id_prefix}combined-1",
+            "title": "東京建設工事",
+            "issuing_org": "省庁A",
+            "description": "東京の建設工事案件",
+            "budget": 10000000,
+            "region": "東京都",
+            "deadline": (now + timedelta(days=30)).strftime("%Y-%m-%d"),
+            "category": "建設工事",
+            "lg_code": "13",
+        }
+
+        # RFP 2: 建設工事 × 大阪府
+        rfp_2 = {
+            "external_id": f"{rfp_external_id_prefix}combined-2",
+            "title": "大阪建設工事",
+            "issuing_org": "省庁B",
+            "description": "大阪の建設工事案件",
+            "budget": 10000000,
+            "region": "大阪府",
+            "deadline": (now + timedelta(days=30)).strftime("%Y-%m-%d"),
+            "category": "建設工事",
+            "lg_code": "27",
+        }
+
+        # RFP 3: 製造・供給 × 東京都
+        rfp_3 = {
+            "external_id": f"{rfp_external_id_prefix}combined-3",
+            "title": "東京製造・供給",
+            "issuing_org": "省庁C",
+            "description": "東京の製造・供給案件",
+            "budget": 5000000,
+            "region": "東京都",
+            "deadline": (now + timedelta(days=30)).strftime("%Y-%m-%d"),
+            "category": "製造・供給",
+            "lg_code": "13",
+        }
+
+        # RFPを作成（複数行を1回のリクエストで作成）
+        batch = supabase_service_client.table("rfps").insert([rfp_1, rfp_2, rfp_3]).execute()
+
+        assert batch.data and len(batch.data) == 3
+
+        # 複合フィルタリング: 建設工事 AND 東京都
+        combined_response = (
+            authenticated_client_1.table("rfps")
+            .select("id,title")
+            .eq("category", "建設工事")
+            .eq("lg_code", "13")
+            .execute()
+        )
+
+        assert combined_response.data is not None
+        combined_titles = {r["title"] for r in combined_response.data}
+
+        # 東京建設工事は含まれるはず
+        assert "東京建設工事" in combined_titles
+
+        # 大阪建設工事と東京製造・供給は含まれないはず
+        assert "大阪建設工事" not in combined_titles
+        assert "東京製造・供給" not in combined_titles
 
     # ========================================================================
     # テスト7: 既存のRFPに対する拡張フィールド読み取り
@@ -634,24 +578,12 @@ class TestRfpsExtendedFieldsRLS:
         # 拡張フィールドのチェック
         # マイグレーションが実行されている場合、フィールドが存在しNULLが返される
         # マイグレーションが実行されていない場合、フィールドキーが存在しない
-        extended_fields = [
-            "category",
-            "procedure_type",
-            "cft_issue_date",
-            "tender_deadline",
-            "opening_event_date",
-            "item_code",
-            "lg_code",
-            "city_code",
-            "certification",
-        ]
-
-        # 拡張フィールドの存在確認
-        has_extended_fields = all(field in fetched_rfp for field in extended_fields)
+        # 拡張フィールドの存在確認（未実行でも失敗しないよう、このテストは全列を取得する）
+        has_extended_fields = all(field in fetched_rfp for field in _EXTENDED_FIELDS)
 
         if has_extended_fields:
             # マイグレーション実行済み: すべての拡張フィールドがNULLであることを確認
-            for field in extended_fields:
+            for field in _EXTENDED_FIELDS:
                 assert fetched_rfp[field] is None, f"Field {field} should be None for pre-migration RFP"
         else:
             # マイグレーション未実行: 拡張フィールドが存在しないことは許容
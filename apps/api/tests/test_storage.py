@@ -0,0 +1,45 @@
+"""
+storageモジュールのテスト
+"""
+import time
+import uuid
+
+import pytest
+
+from services.storage import _generate_document_id
+
+
+@pytest.mark.unit
+class TestGenerateDocumentId:
+    """_generate_document_id関数のテストクラス"""
+
+    def test_UUIDv7形式(self):
+        """バージョン7、RFC 4122バリアントのUUIDが生成されることを確認"""
+        document_id = uuid.UUID(_generate_document_id())
+
+        assert document_id.version == 7
+        assert document_id.variant == uuid.RFC_4122
+
+    def test_先頭48ビットは現在時刻のミリ秒(self):
+        """先頭48ビットに格納されたミリ秒単位のUNIX時刻が現在時刻に近いことを確認"""
+        before_ms = int(time.time() * 1000)
+        document_id = uuid.UUID(_generate_document_id())
+        after_ms = int(time.time() * 1000)
+
+        timestamp_ms = document_id.int >> 80
+        assert before_ms - 1 <= timestamp_ms <= after_ms + 1
+
+    def test_生成順にソートされる(self):
+        """ミリ秒が異なれば、生成した順に文字列としてもソートされることを確認"""
+        document_ids = []
+        for _ in range(5):
+            document_ids.append(_generate_document_id())
+            time.sleep(0.002)
+
+        assert sorted(document_ids) == document_ids
+
+    def test_一意性(self):
+        """同じミリ秒内に生成しても重複しないことを確認"""
+        document_ids = [_generate_document_id() for _ in range(1000)]
+
+        assert len(set(document_ids)) == len(document_ids)
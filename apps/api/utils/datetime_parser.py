@@ -4,10 +4,15 @@ KKJ API日時形式パーサー
 KKJ APIの日時形式（YYYY/MM/DD HH:MM:SS）をPostgreSQL TIMESTAMP WITH TIME ZONEに変換します。
 """
 
+import re
 from datetime import datetime
 from typing import Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
-import pytz
+# KKJ APIが返すゼロ埋め固定長の日時形式（YYYY/MM/DD HH:MM:SS）
+_KKJ_DATETIME_PATTERN = re.compile(
+    r"(\d{4})/(\d{2})/(\d{2}) (\d{2}):(\d{2}):(\d{2})", re.ASCII
+)
 
 
 def parse_kkj_datetime(
@@ -23,14 +28,14 @@ def parse_kkj_datetime(
         date_str: KKJ API日時文字列（例: "2025/11/15 14:00:00"）
                  None、空文字列、または無効なフォーマットの場合はNoneを返します
         timezone: タイムゾーン名（デフォルト: "Asia/Tokyo"）
-                 pytzでサポートされるタイムゾーン名を指定できます
+                 IANAタイムゾーンデータベースの名前を指定できます
 
     Returns:
         タイムゾーン付きdatetimeオブジェクト、またはNone
 
     Examples:
         >>> parse_kkj_datetime("2025/11/15 14:00:00")
-        datetime.datetime(2025, 11, 15, 14, 0, 0, tzinfo=<DstTzInfo 'Asia/Tokyo' JST+9:00:00 STD>)
+        datetime.datetime(2025, 11, 15, 14, 0, 0, tzinfo=zoneinfo.ZoneInfo(key='Asia/Tokyo'))
 
         >>> parse_kkj_datetime("")
         None
@@ -42,7 +47,7 @@ def parse_kkj_datetime(
         None
 
         >>> parse_kkj_datetime("2025/12/01 09:30:00", "UTC")
-        datetime.datetime(2025, 12, 1, 9, 30, 0, tzinfo=<UTC>)
+        datetime.datetime(2025, 12, 1, 9, 30, 0, tzinfo=zoneinfo.ZoneInfo(key='UTC'))
     """
     # None または 空文字列の場合はNoneを返す
     if not date_str:
@@ -50,14 +55,16 @@ def parse_kkj_datetime(
 
     try:
         # KKJ API日時形式でパース
-        naive_dt = datetime.strptime(date_str, "%Y/%m/%d %H:%M:%S")
+        # 固定長形式は書式文字列を解釈せずに直接組み立てる（範囲外の値はValueError）
+        match = _KKJ_DATETIME_PATTERN.fullmatch(date_str)
+        if match:
+            naive_dt = datetime(*map(int, match.groups()))
+        else:
+            naive_dt = datetime.strptime(date_str, "%Y/%m/%d %H:%M:%S")
 
         # タイムゾーンを付与
-        tz = pytz.timezone(timezone)
-        aware_dt = tz.localize(naive_dt)
+        return naive_dt.replace(tzinfo=ZoneInfo(timezone))
 
-        return aware_dt
-
-    except (ValueError, pytz.exceptions.UnknownTimeZoneError):
+    except (ValueError, ZoneInfoNotFoundError):
         # パースエラーまたは無効なタイムゾーンの場合はNoneを返す
         return None
@@ -11,10 +11,10 @@ KKJ APIのXMLレスポンスから添付ファイルURLを抽出します。
 
 import defusedxml.ElementTree as ET
 from defusedxml.common import EntitiesForbidden
-from typing import List
+from typing import List, Union
 
 
-def extract_attachment_urls(xml_content: str) -> List[str]:
+def extract_attachment_urls(xml_content: Union[str, bytes]) -> List[str]:
     """
     KKJ API XMLレスポンスから添付ファイルのURLを全て抽出します。
 
@@ -23,6 +23,8 @@ def extract_attachment_urls(xml_content: str) -> List[str]:
 
     Args:
         xml_content: KKJ APIから返されたXML文字列
+            （レスポンスのバイト列をそのまま渡すこともできる。その場合はXML宣言の
+            encodingに従ってデコードされ、文字列への変換コピーが発生しない）
 
     Returns:
         添付ファイルURLのリスト（見つからない場合は空リスト）
@@ -65,6 +67,12 @@ def extract_attachment_urls(xml_content: str) -> List[str]:
         >>> extract_attachment_urls(xml_with_multiple)
         ['https://example.com/doc1.docx', 'https://example.com/doc2.xlsx']
     """
+    # Attachment要素を含まない文書はパースせずに空リストを返す
+    # （パースエラーになる文字列も結果は空リストのため、挙動は変わらない）
+    marker = b"<Attachment" if isinstance(xml_content, bytes) else "<Attachment"
+    if marker not in xml_content:
+        return []
+
     try:
         # XML文字列をパース
         root = ET.fromstring(xml_content)
@@ -73,9 +81,12 @@ def extract_attachment_urls(xml_content: str) -> List[str]:
         urls: List[str] = []
         for attachment in root.iter("Attachment"):
             # Attachment要素内のURL要素を検索
+            # 空白のみのURLは空のURL要素と同様に無視する
             url_element = attachment.find("URL")
-            if url_element is not None and url_element.text:
-                urls.append(url_element.text.strip())
+            if url_element is None or not url_element.text:
+                continue
+            if url := url_element.text.strip():
+                urls.append(url)
 
         return urls
 
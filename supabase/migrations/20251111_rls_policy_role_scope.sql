@@ -0,0 +1,43 @@
+-- =====================================================
+-- RLSポリシー対象ロール限定マイグレーション
+-- 作成日: 2025-11-11
+-- 説明: ユーザー向けRLSポリシーの対象ロールをauthenticatedに限定
+-- =====================================================
+
+-- -----------------------------------------------
+-- 目的: TO句のないポリシーはPUBLIC（anonを含む全ロール）に適用され、
+--       未認証リクエストでもUSING式が評価される。
+--       auth.uid()で所有者を判定するポリシーはauthenticatedでしか真にならないため、
+--       対象ロールを限定してanonでの評価を省く（anonは該当ポリシーなし = 0件で従来と同じ結果）
+-- 備考: 各テーブル・各操作の許可ポリシーはロールごとに1つのみで、統合が必要な重複はない
+--       （service_roleはRLSをバイパスするため、service_role向けポリシーは変更しない）
+-- -----------------------------------------------
+
+-- companies
+ALTER POLICY "Users can view their own company" ON companies TO authenticated;
+ALTER POLICY "Users can create their own company" ON companies TO authenticated;
+ALTER POLICY "Users can update their own company" ON companies TO authenticated;
+
+-- company_documents
+ALTER POLICY "Users can view their company documents" ON company_documents TO authenticated;
+ALTER POLICY "Users can create their company documents" ON company_documents TO authenticated;
+ALTER POLICY "Users can update their company documents" ON company_documents TO authenticated;
+ALTER POLICY "Users can delete their company documents" ON company_documents TO authenticated;
+
+-- bookmarks
+ALTER POLICY "Users can view their own bookmarks" ON bookmarks TO authenticated;
+ALTER POLICY "Users can create their own bookmarks" ON bookmarks TO authenticated;
+ALTER POLICY "Users can delete their own bookmarks" ON bookmarks TO authenticated;
+
+-- match_snapshots
+ALTER POLICY "Users can view their own match snapshots" ON match_snapshots TO authenticated;
+
+-- company_skill_embeddings
+ALTER POLICY "Users can view their company skill embeddings" ON company_skill_embeddings TO authenticated;
+
+-- -----------------------------------------------
+-- スキーマバージョン更新
+-- -----------------------------------------------
+INSERT INTO schema_version (version, description)
+VALUES (3, 'RLS policy role scope: restrict user-facing policies to authenticated')
+ON CONFLICT (version) DO NOTHING;
@@ -0,0 +1,55 @@
+-- =====================================================
+-- RLSポリシーauth.uid()評価回数削減マイグレーション
+-- 作成日: 2025-11-12
+-- 説明: ユーザー向けRLSポリシーのauth.uid()を(select auth.uid())に置き換え
+-- =====================================================
+
+-- -----------------------------------------------
+-- 目的: USING / WITH CHECK式内のauth.uid()は行ごとに関数呼び出しされる。
+--       (select auth.uid())とすることでInitPlanとしてクエリごとに1回だけ評価される
+-- 備考: 会社経由の所有者判定は既に company_id IN (SELECT ...) 形式（セミジョイン）のため、
+--       サブクエリ内のauth.uid()のみ置き換える
+-- -----------------------------------------------
+
+-- companies
+ALTER POLICY "Users can view their own company" ON companies
+    USING ((select auth.uid()) = user_id);
+ALTER POLICY "Users can create their own company" ON companies
+    WITH CHECK ((select auth.uid()) = user_id);
+ALTER POLICY "Users can update their own company" ON companies
+    USING ((select auth.uid()) = user_id)
+    WITH CHECK ((select auth.uid()) = user_id);
+
+-- company_documents
+ALTER POLICY "Users can view their company documents" ON company_documents
+    USING (company_id IN (SELECT id FROM companies WHERE user_id = (select auth.uid())));
+ALTER POLICY "Users can create their company documents" ON company_documents
+    WITH CHECK (company_id IN (SELECT id FROM companies WHERE user_id = (select auth.uid())));
+ALTER POLICY "Users can update their company documents" ON company_documents
+    USING (company_id IN (SELECT id FROM companies WHERE user_id = (select auth.uid())))
+    WITH CHECK (company_id IN (SELECT id FROM companies WHERE user_id = (select auth.uid())));
+ALTER POLICY "Users can delete their company documents" ON company_documents
+    USING (company_id IN (SELECT id FROM companies WHERE user_id = (select auth.uid())));
+
+-- bookmarks
+ALTER POLICY "Users can view their own bookmarks" ON bookmarks
+    USING ((select auth.uid()) = user_id);
+ALTER POLICY "Users can create their own bookmarks" ON bookmarks
+    WITH CHECK ((select auth.uid()) = user_id);
+ALTER POLICY "Users can delete their own bookmarks" ON bookmarks
+    USING ((select auth.uid()) = user_id);
+
+-- match_snapshots
+ALTER POLICY "Users can view their own match snapshots" ON match_snapshots
+    USING ((select auth.uid()) = user_id);
+
+-- company_skill_embeddings
+ALTER POLICY "Users can view their company skill embeddings" ON company_skill_embeddings
+    USING (company_id IN (SELECT id FROM companies WHERE user_id = (select auth.uid())));
+
+-- -----------------------------------------------
+-- スキーマバージョン更新
+-- -----------------------------------------------
+INSERT INTO schema_version (version, description)
+VALUES (4, 'RLS policy auth.uid() initplan: wrap auth.uid() in (select auth.uid())')
+ON CONFLICT (version) DO NOTHING;
@@ -0,0 +1,25 @@
+-- =====================================================
+-- rfps カテゴリ+都道府県コード複合インデックスマイグレーション
+-- 作成日: 2025-11-13
+-- 説明: category と lg_code を組み合わせた絞り込み用の複合インデックスを追加
+-- =====================================================
+
+-- -----------------------------------------------
+-- 目的: GET /api/rfps は category と lg_code の両方で絞り込めるが、
+--       既存インデックスは単一列（idx_rfps_category, idx_rfps_lg_code）のみのため、
+--       両条件を1回のインデックススキャンで満たせるようにする
+-- 備考: tender_deadline の範囲検索は既存の idx_rfps_tender_deadline（部分インデックス）で対応済み
+--       マイグレーションはトランザクション内で実行されるため CONCURRENTLY は使用しない
+-- -----------------------------------------------
+
+-- idx_rfps_category_lg_code: カテゴリ+都道府県コード複合インデックス（部分インデックス）
+CREATE INDEX IF NOT EXISTS idx_rfps_category_lg_code
+ON rfps(category, lg_code)
+WHERE category IS NOT NULL AND lg_code IS NOT NULL;
+
+-- -----------------------------------------------
+-- スキーマバージョン更新
+-- -----------------------------------------------
+INSERT INTO schema_version (version, description)
+VALUES (5, 'rfps composite index: idx_rfps_category_lg_code on (category, lg_code)')
+ON CONFLICT (version) DO NOTHING;
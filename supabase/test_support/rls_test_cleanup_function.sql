@@ -0,0 +1,66 @@
+-- =====================================================
+-- RLSテスト用クリーンアップ関数（テスト用プロジェクト専用）
+-- 作成日: 2025-11-09
+-- 説明: RLSテストユーザーの関連データ（および任意でユーザー本体）を1回のRPCで削除
+-- 適用: auth.usersを削除するSECURITY DEFINER関数のため、マイグレーションには含めない。
+--       RLSテストを実行するテスト用プロジェクトにのみ手動で適用する
+--       例: psql "$TEST_DATABASE_URL" -f supabase/test_support/rls_test_cleanup_function.sql
+-- =====================================================
+
+-- -----------------------------------------------
+-- 1. テストユーザークリーンアップ関数
+-- -----------------------------------------------
+-- 目的: テーブルごとのDELETE（最大6往復）を1トランザクション・1往復にまとめる
+-- 安全策: RLSテストが作成するメールアドレス（rfp-radar-test+...）のユーザーのみ対象
+-- 実行権限: service_roleのみ
+-- -----------------------------------------------
+
+CREATE OR REPLACE FUNCTION cleanup_test_user(
+    uid uuid,
+    delete_user boolean DEFAULT true
+)
+RETURNS void
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+    -- 入力バリデーション
+    IF uid IS NULL THEN
+        RAISE EXCEPTION 'uid cannot be NULL';
+    END IF;
+
+    IF NOT EXISTS (
+        SELECT 1 FROM auth.users u
+        WHERE u.id = uid
+          AND u.email LIKE 'rfp-radar-test+%'
+    ) THEN
+        RAISE EXCEPTION 'user % is not an RLS test user', uid;
+    END IF;
+
+    -- company_idを参照するテーブルを先に削除
+    DELETE FROM company_skill_embeddings
+    WHERE company_id IN (SELECT c.id FROM companies c WHERE c.user_id = uid);
+
+    DELETE FROM company_documents
+    WHERE company_id IN (SELECT c.id FROM companies c WHERE c.user_id = uid);
+
+    -- user_idを参照するテーブルを削除
+    DELETE FROM match_snapshots WHERE user_id = uid;
+    DELETE FROM bookmarks WHERE user_id = uid;
+    DELETE FROM companies WHERE user_id = uid;
+
+    -- ユーザー本体を削除（残りの参照はON DELETE CASCADEで削除される）
+    IF delete_user THEN
+        DELETE FROM auth.users WHERE id = uid;
+    END IF;
+END;
+$$;
+
+-- service_role以外からの実行を禁止
+REVOKE ALL ON FUNCTION cleanup_test_user(uuid, boolean) FROM PUBLIC;
+REVOKE ALL ON FUNCTION cleanup_test_user(uuid, boolean) FROM anon, authenticated;
+GRANT EXECUTE ON FUNCTION cleanup_test_user(uuid, boolean) TO service_role;
+
+COMMENT ON FUNCTION cleanup_test_user IS
+'RLSテスト専用のクリーンアップ関数。テストユーザーの関連データを1トランザクションで削除し、delete_user=trueの場合はユーザー本体も削除する。';
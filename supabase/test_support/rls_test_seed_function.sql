@@ -0,0 +1,90 @@
+-- =====================================================
+-- RLSテスト用シード関数（テスト用プロジェクト専用）
+-- 作成日: 2025-11-10
+-- 説明: RLSテストユーザーの会社・会社ドキュメント・スキル埋め込みを1回のRPCで作成
+-- 適用: テストデータを作成するSECURITY DEFINER関数のため、マイグレーションには含めない。
+--       RLSテストを実行するテスト用プロジェクトにのみ手動で適用する
+--       例: psql "$TEST_DATABASE_URL" -f supabase/test_support/rls_test_seed_function.sql
+-- =====================================================
+
+-- -----------------------------------------------
+-- 1. テストデータシード関数
+-- -----------------------------------------------
+-- 目的: 依存関係のあるINSERT（会社 → ドキュメント/埋め込み）を1トランザクション・1往復にまとめる
+-- 安全策: RLSテストが作成するメールアドレス（rfp-radar-test+...）のユーザーのみ対象
+-- 実行権限: service_roleのみ
+-- 戻り値: {"company": {...}, "company_document": {...}, "company_skill_embedding": {...}}
+--         （引数がNULLの項目はnull）
+-- -----------------------------------------------
+
+CREATE OR REPLACE FUNCTION seed_test_data(
+    uid uuid,
+    company jsonb,
+    company_document jsonb DEFAULT NULL,
+    company_skill_embedding jsonb DEFAULT NULL
+)
+RETURNS json
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+    v_company companies;
+    v_document company_documents;
+    v_embedding company_skill_embeddings;
+BEGIN
+    -- 入力バリデーション
+    IF uid IS NULL OR company IS NULL THEN
+        RAISE EXCEPTION 'uid and company cannot be NULL';
+    END IF;
+
+    IF NOT EXISTS (
+        SELECT 1 FROM auth.users u
+        WHERE u.id = uid
+          AND u.email LIKE 'rfp-radar-test+%'
+    ) THEN
+        RAISE EXCEPTION 'user % is not an RLS test user', uid;
+    END IF;
+
+    -- 会社を作成
+    INSERT INTO companies (user_id, name, description, regions, budget_min, budget_max, skills, ng_keywords)
+    SELECT uid, r.name, r.description,
+           COALESCE(r.regions, '{}'), r.budget_min, r.budget_max,
+           COALESCE(r.skills, '{}'), COALESCE(r.ng_keywords, '{}')
+    FROM jsonb_populate_record(NULL::companies, company) r
+    RETURNING * INTO v_company;
+
+    -- company_idを参照するテーブルを作成
+    IF company_document IS NOT NULL THEN
+        INSERT INTO company_documents (company_id, title, kind, storage_path, url, size_bytes, tags, description)
+        SELECT v_company.id, r.title, r.kind, r.storage_path, r.url,
+               r.size_bytes, COALESCE(r.tags, '{}'), r.description
+        FROM jsonb_populate_record(NULL::company_documents, company_document) r
+        RETURNING * INTO v_document;
+    END IF;
+
+    IF company_skill_embedding IS NOT NULL THEN
+        INSERT INTO company_skill_embeddings (company_id, skill_text, embedding)
+        VALUES (
+            v_company.id,
+            company_skill_embedding->>'skill_text',
+            (company_skill_embedding->>'embedding')::vector
+        )
+        RETURNING * INTO v_embedding;
+    END IF;
+
+    RETURN json_build_object(
+        'company', to_json(v_company),
+        'company_document', CASE WHEN v_document.id IS NULL THEN NULL ELSE to_json(v_document) END,
+        'company_skill_embedding', CASE WHEN v_embedding.id IS NULL THEN NULL ELSE to_json(v_embedding) END
+    );
+END;
+$$;
+
+-- service_role以外からの実行を禁止
+REVOKE ALL ON FUNCTION seed_test_data(uuid, jsonb, jsonb, jsonb) FROM PUBLIC;
+REVOKE ALL ON FUNCTION seed_test_data(uuid, jsonb, jsonb, jsonb) FROM anon, authenticated;
+GRANT EXECUTE ON FUNCTION seed_test_data(uuid, jsonb, jsonb, jsonb) TO service_role;
+
+COMMENT ON FUNCTION seed_test_data IS
+'RLSテスト専用のシード関数。テストユーザーの会社と、指定された会社ドキュメント・スキル埋め込みを1トランザクションで作成し、作成した行をJSONで返す。';